@@ -0,0 +1,271 @@
+"""
+In-memory alert index evaluated on every price update.
+
+Active alerts are grouped per (asset, currency, direction) into a sorted
+list of thresholds with the alert ids alongside. When the price of an asset
+moves from `prev` to `new`, the alerts that fired are exactly the
+thresholds between the two, so two bisects find them. A tick costs
+two bisects per currency plus the alerts that fire, however many alerts
+are registered.
+
+Each process keeps its own index. Every rule change (and every batch of
+triggered alerts) is published as a numbered change in the shared cache:
+the version counter is incremented and the change stored under the new
+number. On the next tick an index applies the changes it hasn't seen with
+insort and delete, so a rule change costs about as much as the change
+itself. Only the first tick in a process loads every active alert. If the
+change log has a gap that doesn't fill (evicted entries, a flushed cache),
+the index is rebuilt from the database on a background thread and swapped
+in, and ticks keep using the old one meanwhile.
+
+Alerts fire once. Several workers may see the same crossing, but marking
+an alert triggered is a conditional update, so repeats are no-ops.
+"""
+import logging
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+
+from django.core.cache import cache
+from django.db import connections
+from django.utils import timezone
+
+from dashboard.fx import usd_rates
+from monitoring.metrics import ALERT_EVALUATION_SECONDS, ALERTS_TRIGGERED
+from .models import Alert
+
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = "alerts_version"
+CHANGE_TTL = 3600
+# A gap in the change log older than this is treated as lost, not in flight
+GAP_GRACE_SECONDS = 5.0
+# Further behind than this, a rebuild is cheaper than replaying
+MAX_REPLAY = 1000
+
+
+def _change_key(version):
+    return f"alerts_change_{version}"
+
+
+def _publish(change):
+    try:
+        version = cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.add(VERSION_KEY, 0, None)
+        version = cache.incr(VERSION_KEY)
+    cache.set(_change_key(version), change, CHANGE_TTL)
+
+
+def publish_upsert(alerts):
+    """Tell every process's index about created, changed or re-armed alerts."""
+    _publish(("upsert", [(a.id, a.asset, a.currency, a.direction, a.threshold) for a in alerts]))
+
+
+def publish_remove(alert_ids):
+    """Tell every process's index that these alerts are gone or no longer armed."""
+    _publish(("remove", list(alert_ids)))
+
+
+class _Thresholds:
+    __slots__ = ("values", "ids")
+
+    def __init__(self):
+        self.values = []
+        self.ids = []
+
+    def take(self, lo, hi):
+        """Remove and return the ids in [lo, hi)."""
+        fired = self.ids[lo:hi]
+        del self.values[lo:hi]
+        del self.ids[lo:hi]
+        return fired
+
+    def insert(self, threshold, alert_id):
+        i = bisect_right(self.values, threshold)
+        self.values.insert(i, threshold)
+        self.ids.insert(i, alert_id)
+
+    def remove(self, threshold, alert_id):
+        i = bisect_left(self.values, threshold)
+        while i < len(self.values) and self.values[i] == threshold:
+            if self.ids[i] == alert_id:
+                del self.values[i]
+                del self.ids[i]
+                return
+            i += 1
+
+
+def _build():
+    """(groups, {alert_id: (group key, threshold)}) for every active alert in the database."""
+    rows = defaultdict(list)
+    queryset = Alert.objects.filter(is_active=True).values_list("id", "asset", "currency", "direction", "threshold")
+    for alert_id, asset, currency, direction, threshold in queryset.iterator(chunk_size=5000):
+        rows[(asset, currency, direction)].append((threshold, alert_id))
+
+    groups, alerts = {}, {}
+    for key, entries in rows.items():
+        entries.sort()
+        bucket = groups[key] = _Thresholds()
+        bucket.values = [threshold for threshold, _ in entries]
+        bucket.ids = [alert_id for _, alert_id in entries]
+        alerts.update((alert_id, (key, threshold)) for threshold, alert_id in entries)
+    return groups, alerts
+
+
+class AlertIndex:
+    def __init__(self):
+        self.version = None
+        self._groups = {}
+        self._alerts = {}
+        self._last_prices = {}
+        self._lock = threading.Lock()
+        self._gap_since = None
+        self._rebuilding = False
+
+    def load(self):
+        """Synchronous full load; only used for a process's first tick."""
+        version = cache.get(VERSION_KEY, 0)
+        self._groups, self._alerts = _build()
+        self.version = version
+
+    def _rebuild(self):
+        try:
+            # Read the version first: changes after it are replayed on top, and replaying is idempotent
+            version = cache.get(VERSION_KEY, 0)
+            groups, alerts = _build()
+            with self._lock:
+                self._groups, self._alerts, self.version = groups, alerts, version
+                self._gap_since = None
+        except Exception as e:
+            logger.error(f"Alert index rebuild failed: {e}")
+        finally:
+            self._rebuilding = False
+            connections.close_all()
+
+    def _rebuild_in_background(self):
+        if not self._rebuilding:
+            self._rebuilding = True
+            threading.Thread(target=self._rebuild, name="alert-index-rebuild", daemon=True).start()
+
+    def _upsert(self, alert_id, asset, currency, direction, threshold):
+        self._remove(alert_id)
+        key = (asset, currency, direction)
+        self._groups.setdefault(key, _Thresholds()).insert(threshold, alert_id)
+        self._alerts[alert_id] = (key, threshold)
+
+    def _remove(self, alert_id):
+        entry = self._alerts.pop(alert_id, None)
+        if entry is not None:
+            key, threshold = entry
+            self._groups[key].remove(threshold, alert_id)
+
+    def apply(self, change):
+        kind, items = change
+        for item in items:
+            if kind == "upsert":
+                self._upsert(*item)
+            else:
+                self._remove(item)
+
+    def _refresh(self):
+        if self.version is None:
+            self.load()
+            return
+
+        version = cache.get(VERSION_KEY, 0)
+        if version == self.version:
+            return
+        if version < self.version or version - self.version > MAX_REPLAY:
+            # Counter reset (flushed cache) or too far behind
+            self._rebuild_in_background()
+            return
+
+        keys = [_change_key(v) for v in range(self.version + 1, version + 1)]
+        changes = cache.get_many(keys)
+        for key in keys:
+            change = changes.get(key)
+            if change is None:
+                # Either still being written by the publisher, or lost
+                self._gap_since = self._gap_since or time.monotonic()
+                if time.monotonic() - self._gap_since > GAP_GRACE_SECONDS:
+                    self._rebuild_in_background()
+                return
+            self.apply(change)
+            self.version += 1
+            self._gap_since = None
+
+    def crossed(self, asset, currency, prev, new):
+        """Pop the ids of alerts for one asset/currency crossed by a move from prev to new."""
+        fired = []
+        if new > prev:
+            above = self._groups.get((asset, currency, "above"))
+            if above:
+                # prev < threshold <= new
+                fired += above.take(bisect_right(above.values, prev), bisect_right(above.values, new))
+        elif new < prev:
+            below = self._groups.get((asset, currency, "below"))
+            if below:
+                # new <= threshold < prev
+                fired += below.take(bisect_left(below.values, new), bisect_left(below.values, prev))
+        for alert_id in fired:
+            self._alerts.pop(alert_id, None)
+        return fired
+
+    def evaluate(self, prices_usd, rates=None):
+        """
+        Feed one {asset: usd_price} update. Returns {alert_id: (currency, price)}
+        for alerts whose thresholds were crossed since the previous update.
+        The first price seen for an asset only sets the baseline. `rates`
+        ({currency: units per USD}) defaults to the current FX table.
+        """
+        if rates is None:
+            # May call CoinGecko; never while other ticks wait on the lock
+            rates = usd_rates()["rates"]
+        with self._lock:
+            self._refresh()
+            fired = {}
+            for asset, price in prices_usd.items():
+                prev = self._last_prices.get(asset)
+                self._last_prices[asset] = price
+                if prev is None or prev == price:
+                    continue
+                # Both ends use today's rate, so FX moves alone never fire an alert
+                for currency, rate in rates.items():
+                    for alert_id in self.crossed(asset, currency, prev * rate, price * rate):
+                        fired[alert_id] = (currency, price * rate)
+            return fired
+
+
+index = AlertIndex()
+
+
+def check_prices(prices_usd):
+    """Evaluate a price update against all alerts and record the ones that fired."""
+    try:
+        # Fetched first so the timing below covers the index, not an FX refresh
+        rates = usd_rates()["rates"]
+        start = time.perf_counter()
+        fired = index.evaluate(prices_usd, rates)
+    except Exception as e:
+        logger.error(f"Alert evaluation failed: {e}")
+        return {}
+    ALERT_EVALUATION_SECONDS.observe(time.perf_counter() - start)
+
+    if fired:
+        # One UPDATE per distinct trigger price (one per currency and asset)
+        by_price = defaultdict(list)
+        for alert_id, (_, price) in fired.items():
+            by_price[price].append(alert_id)
+        now = timezone.now()
+        for price, ids in by_price.items():
+            Alert.objects.filter(id__in=ids, is_active=True).update(
+                is_active=False, triggered_at=now, triggered_price=price
+            )
+        # Other processes may not have seen this tick; disarm the alerts there too
+        publish_remove(fired)
+        ALERTS_TRIGGERED.inc(len(fired))
+        logger.info(f"{len(fired)} price alerts triggered")
+    return fired
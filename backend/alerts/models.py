@@ -0,0 +1,22 @@
+from django.db import models
+from django.conf import settings
+
+
+class Alert(models.Model):
+    DIRECTION_CHOICES = [
+        ("above", "Above"),
+        ("below", "Below"),
+    ]
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    asset = models.CharField(max_length=10)
+    direction = models.CharField(max_length=5, choices=DIRECTION_CHOICES)
+    threshold = models.FloatField()
+    # Quote currency the threshold is expressed in
+    currency = models.CharField(max_length=3, default='USD')
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    triggered_at = models.DateTimeField(null=True, blank=True)
+    triggered_price = models.FloatField(null=True, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['is_active', 'asset'])]
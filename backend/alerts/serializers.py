@@ -0,0 +1,19 @@
+from rest_framework import serializers
+from dashboard.fx import SUPPORTED_CURRENCIES
+from dashboard.assets import COINGECKO_IDS
+from .models import Alert
+
+
+class AlertSerializer(serializers.ModelSerializer):
+    asset = serializers.ChoiceField(choices=list(COINGECKO_IDS))
+    currency = serializers.ChoiceField(choices=SUPPORTED_CURRENCIES, required=False)
+
+    class Meta:
+        model = Alert
+        fields = ['id', 'asset', 'direction', 'threshold', 'currency', 'is_active', 'created_at', 'triggered_at', 'triggered_price']
+        read_only_fields = ['is_active', 'created_at', 'triggered_at', 'triggered_price']
+
+    def validate_threshold(self, value):
+        if value <= 0:
+            raise serializers.ValidationError("Threshold must be positive")
+        return value
@@ -0,0 +1,7 @@
+from django.urls import path
+from .views import alerts, alert_detail
+
+urlpatterns = [
+    path('alerts/', alerts, name='alerts'),
+    path('alerts/<int:alert_id>/', alert_detail, name='alert-detail'),
+]
@@ -0,0 +1,63 @@
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from monitoring.timing import timed
+from onboarding.models import UserPreferences
+from .engine import publish_remove, publish_upsert
+from .models import Alert
+from .serializers import AlertSerializer
+
+
+@api_view(['GET', 'POST'])
+@permission_classes([IsAuthenticated])
+def alerts(request):
+    """
+    GET: the user's alerts, newest first (?active=true for armed ones only).
+    POST: create an above/below alert; the currency defaults to the user's quote currency.
+    """
+    if request.method == 'GET':
+        with timed('db'):
+            queryset = Alert.objects.filter(user=request.user).order_by('-created_at')
+            if request.GET.get('active') == 'true':
+                queryset = queryset.filter(is_active=True)
+            data = AlertSerializer(queryset, many=True).data
+        return Response(data)
+
+    serializer = AlertSerializer(data=request.data)
+    if serializer.is_valid():
+        currency = serializer.validated_data.get('currency')
+        if not currency:
+            with timed('prefs'):
+                prefs = UserPreferences.objects.filter(user=request.user).first()
+            currency = prefs.quote_currency if prefs else 'USD'
+        with timed('db'):
+            alert = serializer.save(user=request.user, currency=currency)
+        publish_upsert([alert])
+        return Response(AlertSerializer(alert).data, status=status.HTTP_201_CREATED)
+    return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+@api_view(['PATCH', 'DELETE'])
+@permission_classes([IsAuthenticated])
+def alert_detail(request, alert_id):
+    """PATCH updates (and re-arms) an alert; DELETE removes it."""
+    with timed('db'):
+        alert = Alert.objects.filter(id=alert_id, user=request.user).first()
+    if alert is None:
+        return Response({'error': 'Alert not found'}, status=status.HTTP_404_NOT_FOUND)
+
+    if request.method == 'DELETE':
+        alert_id = alert.id
+        with timed('db'):
+            alert.delete()
+        publish_remove([alert_id])
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    serializer = AlertSerializer(alert, data=request.data, partial=True)
+    if serializer.is_valid():
+        with timed('db'):
+            alert = serializer.save(is_active=True, triggered_at=None, triggered_price=None)
+        publish_upsert([alert])
+        return Response(AlertSerializer(alert).data)
+    return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,91 @@
+"""
+Compare the packed series codec with the pickled list-of-lists format
+previously stored under cg_hist_* keys.
+
+    python -m benchmarks.codec --output codec.json
+
+Reports bytes per entry and per point, plus the cost of a cache hit
+(unpickling the stored value) and of decoding the points, for each period.
+"""
+import argparse
+import json
+import os
+import pickle
+import random
+import sys
+import timeit
+
+
+# Points per CoinGecko market_chart response at its automatic granularity
+PERIOD_POINTS = {"1d": (288, 300_000), "7d": (168, 3_600_000), "30d": (720, 3_600_000), "1y": (365, 86_400_000)}
+
+
+def make_series(count, step_ms, seed):
+    rng = random.Random(seed)
+    ts = 1_700_000_000_000
+    price = 45000.0
+    points = []
+    for _ in range(count):
+        # CoinGecko timestamps jitter by a few ms around the nominal step
+        ts += step_ms + rng.randint(-40, 40)
+        price *= 1 + rng.gauss(0, 0.004)
+        points.append([ts, price])
+    return points
+
+
+def best(stmt, number):
+    return min(timeit.repeat(stmt, number=number, repeat=5)) / number * 1e6
+
+
+def measure(points, number):
+    from dashboard.codec import PackedSeries, encode_series
+
+    legacy = pickle.dumps(points, pickle.HIGHEST_PROTOCOL)
+    results = {
+        "legacy_pickle": {
+            "bytes": len(legacy),
+            "bytes_per_point": round(len(legacy) / len(points), 2),
+            "hit_us": round(best(lambda: pickle.loads(legacy), number), 2),
+            "decode_us": round(best(lambda: pickle.loads(legacy), number), 2),
+        }
+    }
+
+    for name, compress in (("packed", False), ("packed_zlib", True)):
+        stored = pickle.dumps(encode_series(points, compress=compress), pickle.HIGHEST_PROTOCOL)
+        results[name] = {
+            "bytes": len(stored),
+            "bytes_per_point": round(len(stored) / len(points), 2),
+            # What fetch_history_coingecko does on a hit that is never iterated
+            "hit_us": round(best(lambda: len(PackedSeries(pickle.loads(stored))), number), 2),
+            "decode_us": round(best(lambda: PackedSeries(pickle.loads(stored)).tolist(), number), 2),
+            "columns_us": round(best(lambda: PackedSeries(pickle.loads(stored)).columns(), number), 2),
+        }
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=200, help="Iterations per timing (default 200)")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "benchmarks.settings")
+    import django
+
+    django.setup()
+
+    report = {
+        period: {"points": count, **measure(make_series(count, step, seed=i), args.number)}
+        for i, (period, (count, step)) in enumerate(PERIOD_POINTS.items())
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        sys.stdout.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""
+Offline load test for the API.
+
+Starts stub upstream servers, serves the real Django app on a local
+threaded WSGI server, drives it with concurrent authenticated clients and
+prints per-endpoint throughput and latency percentiles as JSON.
+
+    python -m benchmarks.run --duration 20 --concurrency 16 --latency-ms 80 \\
+        --error-rate 0.05 --stub coingecko:rate_limit_rate=0.2 --output bench.json
+"""
+import argparse
+import dataclasses
+import json
+import os
+import platform
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from .stubs import StubBehavior, start_stubs
+
+
+DEFAULT_ENDPOINTS = [
+    "auth/me/",
+    "preferences/",
+    "dashboard/votes/",
+    "dashboard/news/",
+    "dashboard/prices/",
+    "dashboard/price-history/?period=7d",
+    "dashboard/price-history-all/",
+    "dashboard/ai-insight/",
+    "dashboard/meme/",
+]
+
+ASSET_MIXES = [["BTC"], ["BTC", "ETH"], ["BTC", "ETH", "SOL"], ["ETH", "SOL"]]
+INVESTOR_TYPES = ["HODLer", "Day Trader", "NFT Collector"]
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=10.0, help="Measured seconds per run (default 10)")
+    parser.add_argument("--warmup", type=float, default=2.0, help="Unmeasured seconds before measuring (default 2)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent clients (default 8)")
+    parser.add_argument("--users", type=int, default=20, help="Distinct users to log in as (default 20)")
+    parser.add_argument("--endpoints", nargs="+", default=DEFAULT_ENDPOINTS, help="Paths under /api/ to exercise")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Stub upstream latency (default 50)")
+    parser.add_argument("--jitter-ms", type=float, default=10.0, help="Stub latency jitter (default 10)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of stub calls answering 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of stub calls answering 429")
+    parser.add_argument(
+        "--stub", action="append", default=[], metavar="NAME:KEY=VALUE[,KEY=VALUE]",
+        help="Per-upstream override, e.g. coingecko:latency_ms=300,rate_limit_rate=0.5",
+    )
+    parser.add_argument("--seed", type=int, default=1234, help="Seed for stub error injection")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    behavior = StubBehavior(args.latency_ms, args.jitter_ms, args.error_rate, args.rate_limit_rate)
+    stubs, env = start_stubs(behavior, seed=args.seed)
+    for override in args.stub:
+        name, _, fields = override.partition(":")
+        values = dict(field.split("=", 1) for field in fields.split(",") if field)
+        stubs[name].behavior = dataclasses.replace(behavior, **{k: float(v) for k, v in values.items()})
+
+    workdir = tempfile.mkdtemp(prefix="moveo-bench-")
+    os.environ.update(env)
+    os.environ.setdefault("BENCHMARK_DB_PATH", os.path.join(workdir, "db.sqlite3"))
+    os.environ.setdefault("PROFILING_DIR", os.path.join(workdir, "profiles"))
+    os.environ["DJANGO_SETTINGS_MODULE"] = "benchmarks.settings"
+
+    import django
+
+    django.setup()
+    base_url, server = serve_django()
+    tokens = create_users(args.users)
+
+    run_load(base_url, args.endpoints, tokens, args.concurrency, args.warmup)
+    samples, elapsed = run_load(base_url, args.endpoints, tokens, args.concurrency, args.duration)
+
+    report = {
+        "config": {
+            "duration_s": args.duration,
+            "concurrency": args.concurrency,
+            "users": args.users,
+            "stubs": {name: dataclasses.asdict(stub.behavior) for name, stub in stubs.items()},
+            "python": platform.python_version(),
+        },
+        "endpoints": {path: summarize(s, elapsed) for path, s in samples.items()},
+        "total": summarize([x for s in samples.values() for x in s], elapsed),
+        "upstream_calls": {name: stub.calls for name, stub in stubs.items()},
+    }
+
+    server.shutdown()
+    for stub in stubs.values():
+        stub.stop()
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        sys.stdout.write(output + "\n")
+
+
+def serve_django():
+    """Serve the WSGI app on an ephemeral port with Django's threaded dev server classes."""
+    from django.core.management import call_command
+    from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+    from django.core.wsgi import get_wsgi_application
+
+    call_command("migrate", verbosity=0)
+
+    class QuietHandler(WSGIRequestHandler):
+        # Headers and body go out in separate writes; with Nagle on, keep-alive
+        # clients would see a ~40ms delayed-ACK stall on every response.
+        disable_nagle_algorithm = True
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadedWSGIServer(("127.0.0.1", 0), QuietHandler, allow_reuse_address=False)
+    server.set_app(get_wsgi_application())
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address
+    return f"http://{host}:{port}/api/", server
+
+
+def create_users(count):
+    """Create onboarded users with varied preferences and return their access tokens."""
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    from onboarding.models import UserPreferences
+    from users.models import User
+
+    tokens = []
+    for i in range(count):
+        user, _ = User.objects.get_or_create(
+            username=f"bench{i}", defaults={"email": f"bench{i}@example.com", "has_completed_onboarding": True}
+        )
+        UserPreferences.objects.update_or_create(
+            user=user,
+            defaults={
+                "crypto_assets": ASSET_MIXES[i % len(ASSET_MIXES)],
+                "investor_type": INVESTOR_TYPES[i % len(INVESTOR_TYPES)],
+                "content_preferences": ["Market News", "Charts"],
+            },
+        )
+        tokens.append(str(RefreshToken.for_user(user).access_token))
+    return tokens
+
+
+def run_load(base_url, endpoints, tokens, concurrency, duration):
+    """Hit every endpoint round-robin from `concurrency` clients; return latency samples per endpoint."""
+    samples = defaultdict(list)
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def client(worker):
+        session = requests.Session()
+        session.headers["Authorization"] = f"Bearer {tokens[worker % len(tokens)]}"
+        local = defaultdict(list)
+        i = worker
+        while time.perf_counter() < deadline:
+            path = endpoints[i % len(endpoints)]
+            i += 1
+            start = time.perf_counter()
+            try:
+                status = session.get(base_url + path, timeout=30).status_code
+            except requests.RequestException:
+                status = 0
+            local[path].append((time.perf_counter() - start, status))
+        with lock:
+            for path, values in local.items():
+                samples[path].extend(values)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(client, range(concurrency)))
+    return samples, time.perf_counter() - start
+
+
+def summarize(samples, elapsed):
+    latencies = sorted(latency for latency, _ in samples)
+    errors = sum(1 for _, status in samples if not 200 <= status < 300)
+    return {
+        "requests": len(samples),
+        "errors": errors,
+        "throughput_rps": round(len(samples) / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+        "max_ms": round(latencies[-1] * 1000, 2) if latencies else None,
+    }
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an ascending list, in milliseconds."""
+    if not sorted_values:
+        return None
+    rank = max(1, -(-pct * len(sorted_values) // 100))
+    return round(sorted_values[int(rank) - 1] * 1000, 2)
+
+
+if __name__ == "__main__":
+    main()
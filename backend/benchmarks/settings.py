@@ -0,0 +1,23 @@
+"""
+Settings for the offline benchmark suite.
+
+Uses a throwaway SQLite database unless DATABASE_URL is set, so runs are
+reproducible without a Postgres server. Upstream API URLs are pointed at
+the local stubs by benchmarks.run before Django is set up.
+"""
+import os
+
+from config.settings import *  # noqa: F401,F403
+
+
+SECRET_KEY = SECRET_KEY or "benchmark-only-secret-key-not-for-production-use"  # noqa: F405
+
+ALLOWED_HOSTS = ["127.0.0.1", "localhost"]
+
+if not os.environ.get("DATABASE_URL"):
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": os.environ.get("BENCHMARK_DB_PATH", "benchmark.sqlite3"),
+        }
+    }
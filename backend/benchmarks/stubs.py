@@ -0,0 +1,236 @@
+"""
+Local stand-ins for the third-party APIs the dashboard calls.
+
+Each upstream gets its own threaded HTTP server with configurable latency,
+error rate and 429 rate, and answers with payloads shaped like the real
+API so the Django views exercise their normal parsing paths.
+"""
+import io
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+BASE_PRICES = {"bitcoin": 45000.0, "ethereum": 2500.0, "solana": 100.0}
+MEME_IMAGE = None
+
+
+@dataclass
+class StubBehavior:
+    latency_ms: float = 50.0
+    jitter_ms: float = 10.0
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+
+
+class StubServer:
+    """A ThreadingHTTPServer on an ephemeral port, serving one fake upstream."""
+
+    def __init__(self, name, handler, behavior, seed=None):
+        self.name = name
+        self.behavior = behavior
+        self.random = random.Random(seed)
+        self.calls = 0
+        self._lock = threading.Lock()
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub._serve(self, handler)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                self.rfile.read(length)
+                stub._serve(self, handler)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self.server.server_address
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _serve(self, request, handler):
+        with self._lock:
+            self.calls += 1
+            roll = self.random.random()
+            delay = max(0.0, self.behavior.latency_ms + self.random.uniform(-1, 1) * self.behavior.jitter_ms)
+
+        time.sleep(delay / 1000)
+
+        if roll < self.behavior.rate_limit_rate:
+            return _send(request, 429, {"error": "rate limited"})
+        if roll < self.behavior.rate_limit_rate + self.behavior.error_rate:
+            return _send(request, 500, {"error": "stub failure"})
+
+        url = urlparse(request.path)
+        payload = handler(url.path, {k: v[0] for k, v in parse_qs(url.query).items()}, self.url)
+        if payload is None:
+            return _send(request, 404, {"error": "not found"})
+        _send(request, 200, payload)
+
+
+def _send(request, status, payload):
+    # bytes are served as an image, anything else as JSON
+    if isinstance(payload, bytes):
+        body, content_type = payload, "image/png"
+    else:
+        body, content_type = json.dumps(payload).encode(), "application/json"
+    request.send_response(status)
+    request.send_header("Content-Type", content_type)
+    request.send_header("Content-Length", str(len(body)))
+    request.end_headers()
+    request.wfile.write(body)
+
+
+def coingecko(path, params, base_url):
+    now_ms = int(time.time() * 1000)
+
+    if path.endswith("/simple/price"):
+        ids = params.get("ids", "").split(",")
+        return {coin: {"usd": BASE_PRICES[coin]} for coin in ids if coin in BASE_PRICES}
+
+    if path.endswith("/exchange_rates"):
+        # CoinGecko quotes every currency against BTC
+        btc = BASE_PRICES["bitcoin"]
+        return {
+            "rates": {
+                code: {"name": code.upper(), "unit": code.upper(), "value": btc * per_usd, "type": "fiat"}
+                for code, per_usd in {"usd": 1.0, "eur": 0.92, "gbp": 0.79, "ils": 3.7}.items()
+            }
+        }
+
+    if path.endswith("/coins/markets"):
+        ids = params.get("ids", "").split(",")
+        return [
+            {
+                "id": coin,
+                "current_price": BASE_PRICES[coin],
+                "price_change_percentage_24h": 1.5,
+                "total_volume": BASE_PRICES[coin] * 1e6,
+                "sparkline_in_7d": {
+                    "price": [BASE_PRICES[coin] * (1 + 0.05 * ((i * 7919) % 200 - 100) / 100) for i in range(168)]
+                },
+            }
+            for coin in ids
+            if coin in BASE_PRICES
+        ]
+
+    if path.endswith("/market_chart"):
+        coin = path.split("/")[-2]
+        if coin not in BASE_PRICES:
+            return None
+        # Match CoinGecko's automatic granularity: 5m for 1 day, hourly up to 90, daily beyond.
+        # Like CoinGecko, the last point is the current price
+        days = int(params.get("days", 7))
+        step_ms = 300_000 if days <= 1 else 3_600_000 if days <= 90 else 86_400_000
+        count = days * 86_400_000 // step_ms
+        base = BASE_PRICES[coin]
+        return {
+            "prices": [
+                [now_ms - (count - i) * step_ms, base * (1 + 0.05 * ((i * 7919) % 200 - 100) / 100)]
+                for i in range(1, count + 1)
+            ]
+        }
+
+    return None
+
+
+def cryptopanic(path, params, base_url):
+    if not path.endswith("/posts/"):
+        return None
+    headlines = [
+        "Bitcoin climbs as ETF inflows extend their weekly streak",
+        # Same story from another outlet; the news view should collapse it
+        "Bitcoin climbs as spot ETF inflows extend weekly streak",
+        "Ethereum developers finalize the next network upgrade timeline",
+        "Solana throughput hits a record as memecoin activity returns",
+        "BTC miners diversify into AI hosting after the halving",
+        "ETH staking yields compress as validator queue grows",
+        "Analysts see SOL outperforming majors into quarter end",
+    ]
+    return {
+        "results": [
+            {
+                "title": title,
+                "url": f"https://example.com/news/{i}",
+                "source": {"title": "Stub Wire"},
+                "published_at": "2025-01-01T00:00:00Z",
+            }
+            for i, title in enumerate(headlines)
+        ]
+    }
+
+
+def openrouter(path, params, base_url):
+    if not path.endswith("/chat/completions"):
+        return None
+    return {
+        "choices": [
+            {"message": {"content": "Markets remain range-bound while long-term holders keep accumulating."}}
+        ]
+    }
+
+
+def _meme_image():
+    # A full-size photo-like PNG, so the thumbnail proxy has real work to do
+    from PIL import Image
+
+    image = Image.effect_mandelbrot((1600, 1200), (-2.0, -1.2, 1.0, 1.2), 100).convert("RGB")
+    out = io.BytesIO()
+    image.save(out, "PNG")
+    return out.getvalue()
+
+
+def meme_api(path, params, base_url):
+    if path == "/images/stub-meme.png":
+        global MEME_IMAGE
+        if MEME_IMAGE is None:
+            MEME_IMAGE = _meme_image()
+        return MEME_IMAGE
+    if not path.startswith("/gimme/"):
+        return None
+    # Served by this stub, like i.redd.it serves the real meme-api's images
+    return {"url": f"{base_url}/images/stub-meme.png", "title": "when you buy the top"}
+
+
+UPSTREAMS = {
+    "coingecko": ("COINGECKO_API_URL", coingecko, "/api/v3"),
+    "cryptopanic": ("CRYPTOPANIC_API_URL", cryptopanic, "/api/v1"),
+    "openrouter": ("OPENROUTER_API_URL", openrouter, "/api/v1"),
+    "meme-api": ("MEME_API_URL", meme_api, ""),
+}
+
+
+def start_stubs(behavior, seed=None):
+    """
+    Start one stub server per upstream. Returns (servers, env) where env
+    maps each *_API_URL setting to the stub's base URL, and lets the meme
+    stub's images through MEME_IMAGE_ORIGINS.
+    """
+    servers, env = {}, {}
+    for offset, (name, (setting, handler, prefix)) in enumerate(UPSTREAMS.items()):
+        server = StubServer(name, handler, behavior, seed=None if seed is None else seed + offset).start()
+        servers[name] = server
+        env[setting] = server.url + prefix
+    # The meme stub serves its own images
+    env["MEME_IMAGE_ORIGINS"] = servers["meme-api"].url
+    return servers, env
@@ -0,0 +1,32 @@
+"""
+PostgreSQL backend that reports connection pool checkout metrics.
+
+Pooling itself is Django's built-in psycopg_pool support (OPTIONS["pool"]);
+this wrapper only times each checkout and exports the pool's occupancy.
+"""
+import time
+
+from django.db.backends.postgresql import base
+from psycopg_pool import PoolTimeout
+
+from monitoring.metrics import DB_POOL_AVAILABLE, DB_POOL_SIZE, DB_POOL_TIMEOUTS, DB_POOL_WAIT_SECONDS
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def get_new_connection(self, conn_params):
+        if not self.pool:
+            return super().get_new_connection(conn_params)
+
+        start = time.perf_counter()
+        try:
+            connection = super().get_new_connection(conn_params)
+        except PoolTimeout:
+            DB_POOL_TIMEOUTS.labels(self.alias).inc()
+            raise
+        finally:
+            DB_POOL_WAIT_SECONDS.labels(self.alias).observe(time.perf_counter() - start)
+
+        stats = self.pool.get_stats()
+        DB_POOL_SIZE.labels(self.alias).set(stats.get('pool_size', 0))
+        DB_POOL_AVAILABLE.labels(self.alias).set(stats.get('pool_available', 0))
+        return connection
@@ -45,6 +45,87 @@ CSRF_TRUSTED_ORIGINS = [
 # OpenRouter API Key
 OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")
 
+# Third-party API base URLs (overridden by the benchmark suite to point at local stubs)
+COINGECKO_API_URL = os.getenv("COINGECKO_API_URL", "https://api.coingecko.com/api/v3")
+CRYPTOPANIC_API_URL = os.getenv("CRYPTOPANIC_API_URL", "https://cryptopanic.com/api/v1")
+OPENROUTER_API_URL = os.getenv("OPENROUTER_API_URL", "https://openrouter.ai/api/v1")
+MEME_API_URL = os.getenv("MEME_API_URL", "https://meme-api.com")
+
+# Shared memory-mapped price store, written by `manage.py run_series_writer`
+# and read zero-copy by every worker. Series older than the staleness limit
+# are ignored so a stopped writer falls back to live CoinGecko calls.
+SERIES_STORE_ENABLED = os.getenv("SERIES_STORE_ENABLED", "true").lower() == "true"
+SERIES_STORE_DIR = os.getenv("SERIES_STORE_DIR", "/tmp/moveo-series")
+SERIES_STORE_MAX_STALENESS = int(os.getenv("SERIES_STORE_MAX_STALENESS", "3600"))
+
+# zlib-compress packed price series in the cache (see dashboard/codec.py). Worth
+# it for network caches; with the in-process cache it only adds decode time.
+SERIES_CACHE_COMPRESSION = os.getenv("SERIES_CACHE_COMPRESSION", "false").lower() == "true"
+
+# How long the USD exchange-rate table (dashboard/fx.py) is reused before refetching
+FX_REFRESH_SECONDS = int(os.getenv("FX_REFRESH_SECONDS", "900"))
+
+# Meme thumbnails (dashboard/thumbnails.py): on-disk cache location and size
+# cap, how long a meme URL keeps pointing at its thumbnail, the largest source
+# image fetched, and the thumbnail's longest side and WebP quality. Source
+# images are only fetched from MEME_IMAGE_ORIGINS (scheme://host[:port])
+MEME_IMAGE_ORIGINS = [
+    origin.strip().lower().rstrip("/")
+    for origin in os.getenv("MEME_IMAGE_ORIGINS", "https://i.redd.it,https://preview.redd.it,https://i.imgur.com").split(",")
+    if origin.strip()
+]
+MEME_CACHE_DIR = os.getenv("MEME_CACHE_DIR", "/tmp/moveo-memes")
+MEME_CACHE_MAX_BYTES = int(os.getenv("MEME_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+MEME_CACHE_MAPPING_TTL = int(os.getenv("MEME_CACHE_MAPPING_TTL", "604800"))
+MEME_SOURCE_MAX_BYTES = int(os.getenv("MEME_SOURCE_MAX_BYTES", str(20 * 1024 * 1024)))
+MEME_THUMB_MAX_SIDE = int(os.getenv("MEME_THUMB_MAX_SIDE", "640"))
+MEME_THUMB_QUALITY = int(os.getenv("MEME_THUMB_QUALITY", "75"))
+
+# How long one coins/markets snapshot (prices, 24h change, sparklines) is shared
+MARKET_SNAPSHOT_TTL = int(os.getenv("MARKET_SNAPSHOT_TTL", "60"))
+
+# Per-user dashboard response cache (dashboard/response_cache.py): how long a
+# built response is kept, and whether saving preferences rebuilds it in the background
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() == "true"
+RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", "600"))
+RESPONSE_CACHE_WARM = os.getenv("RESPONSE_CACHE_WARM", "true").lower() == "true"
+
+# Live price stream (/api/dashboard/stream/): upstream poll interval, events
+# buffered per slow client before the oldest is dropped, keepalive period, and
+# how long a stream ticket stays valid before it is used
+LIVE_POLL_INTERVAL = float(os.getenv("LIVE_POLL_INTERVAL", "10"))
+LIVE_QUEUE_SIZE = int(os.getenv("LIVE_QUEUE_SIZE", "16"))
+LIVE_HEARTBEAT_SECONDS = float(os.getenv("LIVE_HEARTBEAT_SECONDS", "15"))
+LIVE_TICKET_TTL = int(os.getenv("LIVE_TICKET_TTL", "30"))
+
+# Admission control (monitoring/admission.py): per-worker caps on concurrent
+# requests per endpoint class, 0 meaning uncapped. Keep the upstream cap below
+# the gunicorn thread count so cheap endpoints always have threads left.
+ADMISSION_CONTROL_ENABLED = os.getenv("ADMISSION_CONTROL_ENABLED", "true").lower() == "true"
+ADMISSION_CLASSES = {
+    "upstream": [
+        "news", "prices", "markets", "price-history", "price-history-all", "indicators",
+        "candles", "portfolio", "ai-insight", "meme",
+    ],
+}
+ADMISSION_LIMITS = {
+    "upstream": int(os.getenv("ADMISSION_UPSTREAM_LIMIT", "6")),
+    "default": int(os.getenv("ADMISSION_DEFAULT_LIMIT", "0")),
+}
+
+# Bearer token Prometheus uses to scrape /api/metrics/ (staff users may also read it)
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+# Emit a Server-Timing breakdown header on every response (off by default)
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", "false").lower() == "true"
+
+# On-demand request profiling: staff send PROFILING_HEADER, or a fraction of
+# all requests is sampled. Only the newest PROFILING_MAX_FILES dumps are kept.
+PROFILING_HEADER = "X-Profile"
+PROFILING_SAMPLE_RATE = float(os.getenv("PROFILING_SAMPLE_RATE", "0"))
+PROFILING_DIR = os.getenv("PROFILING_DIR", "/tmp/moveo-profiles")
+PROFILING_MAX_FILES = int(os.getenv("PROFILING_MAX_FILES", "50"))
+
 
 
 # Application definition
@@ -63,9 +144,17 @@ INSTALLED_APPS = [
     'onboarding',
     'dashboard',
     'feedback',
+    'monitoring',
+    'alerts',
+    'portfolio',
+    'exports',
 ]
 
 MIDDLEWARE = [
+    'monitoring.middleware.MetricsMiddleware',
+    'monitoring.middleware.ServerTimingMiddleware',
+    'monitoring.middleware.ProfilingMiddleware',
+    'monitoring.middleware.AdmissionControlMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -132,6 +221,28 @@ else:
         }
     }
 
+# Connection pooling via psycopg_pool (Django's "pool" option). Each worker
+# process keeps its own pool; connections are health-checked on checkout and
+# recycled after DB_POOL_MAX_LIFETIME seconds. Pool wait times are exported
+# through the config.postgresql backend.
+DB_POOL_ENABLED = os.getenv("DB_POOL_ENABLED", "true").lower() == "true"
+
+DATABASES['default']['ENGINE'] = 'config.postgresql'
+DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+
+if DB_POOL_ENABLED:
+    DATABASES['default']['CONN_MAX_AGE'] = 0  # Pooling replaces persistent connections
+    DATABASES['default']['OPTIONS'] = {
+        'pool': {
+            'min_size': int(os.getenv("DB_POOL_MIN_SIZE", "2")),
+            'max_size': int(os.getenv("DB_POOL_MAX_SIZE", "10")),
+            'max_lifetime': float(os.getenv("DB_POOL_MAX_LIFETIME", "1800")),
+            'timeout': float(os.getenv("DB_POOL_TIMEOUT", "10")),
+        },
+    }
+else:
+    DATABASES['default']['CONN_MAX_AGE'] = int(os.getenv("CONN_MAX_AGE", "60"))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
@@ -180,13 +291,43 @@ AUTH_USER_MODEL = 'users.User'
 # REST Framework Configuration
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.TimedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    # Throttled requests replay the client's previous result when there is one
+    'EXCEPTION_HANDLER': 'dashboard.throttles.exception_handler',
+    # Sliding windows per endpoint (see dashboard/throttles.py): "<endpoint>" is
+    # per user, "<endpoint>_global" is shared by all users
+    'DEFAULT_THROTTLE_RATES': {
+        'ai_insight': os.getenv('THROTTLE_AI_INSIGHT', '10/min'),
+        'ai_insight_global': os.getenv('THROTTLE_AI_INSIGHT_GLOBAL', '120/min'),
+        'meme': os.getenv('THROTTLE_MEME', '20/min'),
+        'meme_global': os.getenv('THROTTLE_MEME_GLOBAL', '300/min'),
+    },
 }
 
+# Throttle windows, FX rates, alert versions and dedup clusters must be shared
+# by all workers, so production should set REDIS_URL. Without it each process
+# keeps its own in-memory cache.
+REDIS_URL = os.getenv("REDIS_URL")
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            # The default of 300 entries is too small for the series and dedup keys
+            'OPTIONS': {'MAX_ENTRIES': 10000},
+        }
+    }
+
 # SimpleJWT Configuration
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(hours=1),
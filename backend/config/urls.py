@@ -10,5 +10,9 @@ urlpatterns = [
     path('api/', include('onboarding.urls')),
     path('api/', include('dashboard.urls')),
     path('api/', include('feedback.urls')),
+    path('api/', include('monitoring.urls')),
+    path('api/', include('alerts.urls')),
+    path('api/', include('portfolio.urls')),
+    path('api/', include('exports.urls')),
 ]
 
@@ -0,0 +1,16 @@
+"""
+Supported assets and chart periods, shared by every app that deals in prices.
+"""
+
+COINGECKO_IDS = {
+    "BTC": "bitcoin",
+    "ETH": "ethereum",
+    "SOL": "solana",
+}
+
+PERIOD_DAY_MAP = {
+    "1d": 1,
+    "7d": 7,
+    "30d": 30,
+    "1y": 365,
+}
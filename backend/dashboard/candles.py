@@ -0,0 +1,81 @@
+"""
+OHLC candles resampled from cached tick series.
+
+Bucketing is vectorized: ticks are grouped by `ts // interval` and each
+group's open/high/low/close comes from one reduceat pass. Each
+(asset, currency, source period, interval) result is cached together with an
+anchor tick. When the source series only gained new ticks since then,
+just the last cached candle is recomputed and the new ones appended.
+"""
+import numpy as np
+from django.core.cache import cache
+
+from monitoring.metrics import cache_get
+
+
+INTERVALS = {
+    "15m": 900_000,
+    "1h": 3_600_000,
+    "4h": 14_400_000,
+    "1d": 86_400_000,
+}
+
+
+def resample(timestamps, prices, interval_ms):
+    """Group sorted ticks into candles; returns a (5, n) array of start, open, high, low, close."""
+    if not len(prices):
+        return np.empty((5, 0))
+
+    buckets = timestamps // interval_ms
+    starts = np.flatnonzero(np.concatenate(([True], buckets[1:] != buckets[:-1])))
+    ends = np.concatenate((starts[1:], [len(prices)])) - 1
+    return np.vstack((
+        buckets[starts] * interval_ms,
+        prices[starts],
+        np.maximum.reduceat(prices, starts),
+        np.minimum.reduceat(prices, starts),
+        prices[ends],
+    ))
+
+
+def candles_for(asset, source_period, interval_ms, timestamps, prices, currency="USD"):
+    """Candles for a whole source series, reusing the cached result where the series only grew."""
+    if not len(prices):
+        return np.empty((5, 0))
+
+    cache_key = f"candles_{asset}_{currency}_{source_period}_{interval_ms}"
+    cached = cache_get("candles", cache_key)
+    candles = _extend(cached, interval_ms, timestamps, prices) if cached else None
+    if candles is None:
+        candles = resample(timestamps, prices, interval_ms)
+
+    # Drop candles for ticks that have aged out of the source window
+    first_start = timestamps[0] // interval_ms * interval_ms
+    candles = candles[:, candles[0] >= first_start]
+
+    # The anchor is the last tick before the final (still open) candle. If a
+    # later series still contains it, everything up to it is unchanged.
+    last_start = candles[0, -1]
+    anchor = np.searchsorted(timestamps, last_start) - 1
+    cache.set(cache_key, {
+        "candles": candles,
+        "anchor": (int(timestamps[anchor]), float(prices[anchor])) if anchor >= 0 else None,
+    }, 3600)
+    return candles
+
+
+def _extend(cached, interval_ms, timestamps, prices):
+    """Recompute only the last cached candle onward, or None if the series was rewritten."""
+    anchor = cached.get("anchor")
+    candles = cached["candles"]
+    if anchor is None or not candles.shape[1]:
+        return None
+
+    index = np.searchsorted(timestamps, anchor[0])
+    if index >= len(timestamps) or timestamps[index] != anchor[0] or prices[index] != anchor[1]:
+        return None
+
+    last_start = candles[0, -1]
+    tail_from = np.searchsorted(timestamps, last_start)
+    tail = resample(timestamps[tail_from:], prices[tail_from:], interval_ms)
+    return np.concatenate((candles[:, :-1], tail), axis=1)
@@ -0,0 +1,163 @@
+"""
+Compact cache encoding for [[ts_ms, price], ...] price series.
+
+Layout: a small header, then the first timestamp followed by the deltas
+between consecutive timestamps (int32 when they fit, else int64), then the
+prices as float64. The body is optionally zlib-compressed; the constant
+deltas of CoinGecko series compress to almost nothing.
+
+Cached entries are stored as bytes and wrapped in PackedSeries on read, so
+a cache hit costs one bytes copy. The points are only decoded when a view
+iterates them or DRF serializes them.
+"""
+import struct
+import sys
+import zlib
+from array import array
+from itertools import accumulate
+
+import numpy as np
+from django.conf import settings
+
+
+MAGIC = b"PXS1"
+# magic, flags, count
+HEADER = struct.Struct("<4sBxxxI")
+
+FLAG_ZLIB = 0x1
+FLAG_WIDE_DELTAS = 0x2
+
+INT32_MAX = 2 ** 31 - 1
+
+
+def encode_series(points, compress=None):
+    """Pack [[ts_ms, price], ...] into bytes."""
+    if compress is None:
+        compress = settings.SERIES_CACHE_COMPRESSION
+
+    timestamps = [int(p[0]) for p in points]
+    deltas = [b - a for a, b in zip(timestamps, timestamps[1:])]
+    wide = any(abs(d) > INT32_MAX for d in deltas)
+
+    flags = FLAG_WIDE_DELTAS if wide else 0
+    body = (
+        _native(array("q", timestamps[:1])).tobytes()
+        + _native(array("q" if wide else "i", deltas)).tobytes()
+        + _native(array("d", (float(p[1]) for p in points))).tobytes()
+    )
+    if compress:
+        flags |= FLAG_ZLIB
+        body = zlib.compress(body, 1)
+
+    return HEADER.pack(MAGIC, flags, len(points)) + body
+
+
+def encode_arrays(timestamps, prices, compress=None):
+    """Pack NumPy (timestamps, prices) arrays; same layout as encode_series."""
+    if compress is None:
+        compress = settings.SERIES_CACHE_COMPRESSION
+
+    timestamps = np.asarray(timestamps, dtype=np.int64)
+    deltas = np.diff(timestamps)
+    wide = bool(len(deltas)) and int(np.abs(deltas).max()) > INT32_MAX
+
+    flags = FLAG_WIDE_DELTAS if wide else 0
+    body = (
+        timestamps[:1].astype("<i8").tobytes()
+        + deltas.astype("<i8" if wide else "<i4").tobytes()
+        + np.asarray(prices, dtype="<f8").tobytes()
+    )
+    if compress:
+        flags |= FLAG_ZLIB
+        body = zlib.compress(body, 1)
+
+    return HEADER.pack(MAGIC, flags, len(timestamps)) + body
+
+
+def is_packed(value):
+    return isinstance(value, bytes) and value[:4] == MAGIC
+
+
+def _native(values):
+    # Stored little-endian regardless of host
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values
+
+
+class PackedSeries:
+    """
+    Read-only sequence over an encoded series. len() and truthiness come
+    from the header; the body is decoded on first access and kept.
+    """
+
+    __slots__ = ("blob", "_flags", "_count", "_points")
+
+    def __init__(self, blob):
+        magic, self._flags, self._count = HEADER.unpack_from(blob)
+        if magic != MAGIC:
+            raise ValueError("not an encoded price series")
+        self.blob = blob
+        self._points = None
+
+    def __len__(self):
+        return self._count
+
+    def __bool__(self):
+        return self._count > 0
+
+    def __iter__(self):
+        return iter(self.tolist())
+
+    def __getitem__(self, index):
+        return self.tolist()[index]
+
+    def _decode(self):
+        body = self.blob[HEADER.size:]
+        if self._flags & FLAG_ZLIB:
+            body = zlib.decompress(body)
+
+        delta_code, delta_size = ("q", 8) if self._flags & FLAG_WIDE_DELTAS else ("i", 4)
+        prices_offset = 8 + delta_size * (self._count - 1)
+
+        first = _native(array("q", body[:8]))[0]
+        deltas = _native(array(delta_code, body[8:prices_offset]))
+        prices = _native(array("d", body[prices_offset:]))
+        return first, deltas, prices
+
+    def columns(self):
+        """Decode to (timestamps array('q'), prices array('d')) without building point lists."""
+        if self._count == 0:
+            return array("q"), array("d")
+        first, deltas, prices = self._decode()
+        return array("q", accumulate(deltas, initial=first)), prices
+
+    def arrays(self):
+        """Decode to NumPy (timestamps int64, prices float64) arrays."""
+        if self._count == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+
+        body = self.blob[HEADER.size:]
+        if self._flags & FLAG_ZLIB:
+            body = zlib.decompress(body)
+
+        delta_type = "<i8" if self._flags & FLAG_WIDE_DELTAS else "<i4"
+        delta_size = np.dtype(delta_type).itemsize
+        prices_offset = 8 + delta_size * (self._count - 1)
+
+        timestamps = np.empty(self._count, dtype=np.int64)
+        timestamps[0] = np.frombuffer(body, "<i8", 1)[0]
+        np.cumsum(np.frombuffer(body, delta_type, self._count - 1, 8), out=timestamps[1:])
+        timestamps[1:] += timestamps[0]
+        return timestamps, np.frombuffer(body, "<f8", self._count, prices_offset).astype(np.float64)
+
+    def tolist(self):
+        """The series as [[ts_ms, price], ...]; also what DRF's JSON encoder calls."""
+        if self._points is None:
+            if self._count == 0:
+                self._points = []
+            else:
+                first, deltas, prices = self._decode()
+                timestamps = accumulate(deltas, initial=first)
+                self._points = [[t, p] for t, p in zip(timestamps, prices.tolist())]
+        return self._points
@@ -0,0 +1,156 @@
+"""
+Delta sync for the news and price-history endpoints.
+
+A client that sends `?since=<cursor>` gets only what is newer than its
+cursor, plus a new cursor to send next time. An empty `since=` starts a
+sync and returns everything. Cursors are opaque URL-safe strings.
+
+- News: the cursor is the highest archive id the client has seen. Archive
+  ids only grow, so newer items are the listed ones with a higher id.
+  Items that didn't make it into the archive have no id; the cursor lists
+  a short hash of the ones already sent instead.
+- Series: the cursor holds an anchor timestamp per (period, asset) and
+  the quote currency. The anchor is the next-to-last point, since the
+  last one is live: the series store updates its newest bucket in place,
+  and CoinGecko's last point is "now". Deltas start at the anchor. Clients
+  drop their points from the delta's first timestamp on, append the
+  delta, and drop points that fall out of the period window.
+
+Both cursors also carry a fingerprint of the user's asset selection.
+When the server's data no longer lines up with a cursor, the response
+sets full_resync and carries the full data. The client must then replace
+its local copy. This happens when the asset selection or quote currency
+changed, the anchor point is gone from the series, or the news archive
+was reset.
+
+A view answering from its hard-coded fallback passes fallback=True. A
+client with a usable cursor then gets an empty delta and keeps its
+cursor, so placeholders never replace good local data. A client without
+one gets the fallback and an empty cursor, which forces a full sync on its
+next request.
+"""
+import base64
+import json
+import zlib
+
+import numpy as np
+
+from .indicators import series_arrays
+
+
+def wants_delta(request):
+    return "since" in request.GET
+
+
+def encode_cursor(state):
+    raw = json.dumps(state, separators=(",", ":"), sort_keys=True).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """The cursor's state, or None if it is empty or malformed."""
+    if not cursor:
+        return None
+    try:
+        state = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (ValueError, TypeError):
+        return None
+    return state if isinstance(state, dict) else None
+
+
+def selection_fingerprint(assets):
+    """Short fingerprint of an asset selection, independent of order."""
+    return f"{zlib.crc32(','.join(sorted(assets)).encode()):08x}"
+
+
+def _url_hash(url):
+    return f"{zlib.crc32(url.encode()):08x}"
+
+
+def news_delta(items, ids, since, latest_id, assets, fallback=False):
+    """
+    Envelope for the news list `items`, whose archive ids are `ids` (None
+    for items that aren't archived), filtered for the selection `assets`.
+    `latest_id` is the archive's current highest id.
+    """
+    selection = selection_fingerprint(assets)
+    state = decode_cursor(since)
+    seen = state.get("news") if state and state.get("assets") == selection else None
+    usable = isinstance(seen, int) and seen <= (latest_id or 0)
+
+    if fallback:
+        if usable:
+            return {"items": [], "cursor": since, "full_resync": False}
+        return {"items": items, "cursor": "", "full_resync": True}
+
+    unarchived = [_url_hash(item["url"]) for item, item_id in zip(items, ids) if item_id is None]
+    cursor = encode_cursor({
+        "news": max([i for i in ids if i is not None] + [seen if usable else 0]),
+        "assets": selection,
+        # Only the ones still listed; an item drops out once it's archived or off the list
+        "unarchived": unarchived,
+    })
+    if not usable:
+        return {"items": items, "cursor": cursor, "full_resync": True}
+
+    sent = set(state.get("unarchived") or [])
+    return {
+        "items": [
+            item for item, item_id in zip(items, ids)
+            if (item_id > seen if item_id is not None else _url_hash(item["url"]) not in sent)
+        ],
+        "cursor": cursor,
+        "full_resync": False,
+    }
+
+
+def series_delta(series, currency, since, assets, fallback=False):
+    """
+    Envelope for {period: {asset: series}} for the selection `assets`.
+    Returns {"series", "cursor", "full_resync"}, where "series" has the
+    same shape with only new points.
+    """
+    selection = selection_fingerprint(assets)
+    state = decode_cursor(since)
+    usable = state and state.get("currency") == currency and state.get("assets") == selection
+    last_seen = state.get("series", {}) if usable else None
+
+    if fallback:
+        if last_seen is not None:
+            return {"series": {}, "cursor": since, "full_resync": False}
+        return {"series": series, "cursor": "", "full_resync": True}
+
+    result, cursor, resync = {}, {}, last_seen is None
+    for period, period_series in series.items():
+        result[period] = {}
+        cursor[period] = {}
+        for asset, hist in period_series.items():
+            timestamps, prices = series_arrays(hist)
+            if len(timestamps) == 0:
+                continue
+            cursor[period][asset] = int(timestamps[-2] if len(timestamps) > 1 else timestamps[-1])
+            if resync:
+                continue
+            since_ts = (last_seen.get(period) or {}).get(asset)
+            start = int(np.searchsorted(timestamps, since_ts)) if since_ts is not None else len(timestamps)
+            if since_ts is None or start == len(timestamps) or timestamps[start] != since_ts:
+                # The anchor point is gone: the series was rewritten or moved past it
+                resync = True
+                continue
+            result[period][asset] = [list(point) for point in zip(timestamps[start:].tolist(), prices[start:].tolist())]
+
+    if resync:
+        result = {
+            period: {asset: hist for asset, hist in period_series.items() if len(hist)}
+            for period, period_series in series.items()
+        }
+    else:
+        # A series that failed to load this time keeps its anchor, so the client's copy stays in sync
+        for period, anchors in last_seen.items():
+            for asset, since_ts in anchors.items():
+                cursor.setdefault(period, {}).setdefault(asset, since_ts)
+    return {
+        "series": result,
+        "cursor": encode_cursor({"currency": currency, "assets": selection, "series": cursor}),
+        "full_resync": resync,
+    }
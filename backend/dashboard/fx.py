@@ -0,0 +1,112 @@
+"""
+Quote-currency conversion for prices and history.
+
+CoinGecko is only ever asked for USD. A USD -> currency table built from
+its /exchange_rates endpoint (rates quoted against BTC) is refreshed every
+FX_REFRESH_SECONDS. Every price and history series is converted locally by
+multiplying with the rate, and converted series are cached per currency.
+"""
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from monitoring import admission
+from monitoring.metrics import cache_get, upstream_request
+from .codec import PackedSeries, encode_arrays, is_packed
+from .indicators import data_version, series_arrays
+
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_CURRENCIES = ["USD", "EUR", "GBP", "ILS"]
+
+# Used until the first successful refresh
+FALLBACK_RATES = {
+    "USD": 1.0,
+    "EUR": 0.92,
+    "GBP": 0.79,
+    "ILS": 3.7,
+}
+
+RATES_KEY = "fx_usd_rates"
+# Last good table, kept much longer than the refresh interval so an
+# upstream outage keeps serving slightly stale rates
+LAST_GOOD_KEY = "fx_usd_rates_last_good"
+
+
+def usd_rates():
+    """{"as_of": unix seconds, "rates": {currency: units per USD}}, refreshed lazily."""
+    table = cache_get("fx", RATES_KEY)
+    if table is not None:
+        return table
+
+    table = download_rates()
+    if table is not None:
+        cache.set(RATES_KEY, table, settings.FX_REFRESH_SECONDS)
+        cache.set(LAST_GOOD_KEY, table, 7 * 86400)
+        return table
+
+    table = cache.get(LAST_GOOD_KEY) or {"as_of": 0, "rates": FALLBACK_RATES}
+    # Don't hammer the upstream while it's failing. A shed request never
+    # reached it, so that says nothing about its health
+    if not admission.is_shed():
+        cache.set(RATES_KEY, table, 60)
+    return table
+
+
+def download_rates():
+    """Uncached CoinGecko /exchange_rates call, rebased from BTC to USD."""
+    try:
+        resp = upstream_request("coingecko", "GET", f"{settings.COINGECKO_API_URL}/exchange_rates", timeout=5)
+        if resp.status_code != 200:
+            logger.warning(f"CG exchange_rates returned {resp.status_code}")
+            return None
+
+        btc_rates = resp.json().get("rates", {})
+        usd = float(btc_rates["usd"]["value"])
+        rates = {"USD": 1.0}
+        for currency in SUPPORTED_CURRENCIES:
+            entry = btc_rates.get(currency.lower())
+            if entry and entry.get("value"):
+                rates[currency] = float(entry["value"]) / usd
+        return {"as_of": int(time.time()), "rates": {**FALLBACK_RATES, **rates}}
+
+    except Exception as e:
+        logger.error(f"Error fetching exchange rates: {e}")
+        return None
+
+
+def rate_for(currency):
+    """Units of `currency` per USD."""
+    return usd_rates()["rates"].get(currency, 1.0)
+
+
+def convert_prices(prices_usd, currency):
+    """Convert an {asset: usd_price} mapping."""
+    if currency == "USD":
+        return prices_usd
+    rate = rate_for(currency)
+    return {asset: price * rate for asset, price in prices_usd.items()}
+
+
+def convert_history(asset, period, hist, currency):
+    """
+    Convert a USD series with one vectorized multiply. The result is cached
+    per (currency, rate table, source version), so each distinct series is
+    converted once per FX refresh no matter how many users read it.
+    """
+    if currency == "USD" or not hist:
+        return hist
+
+    table = usd_rates()
+    cache_key = f"fx_hist_{asset}_{period}_{currency}_{table['as_of']}_{data_version(hist)}"
+    cached = cache_get("fx_hist", cache_key)
+    if cached is not None:
+        return PackedSeries(cached) if is_packed(cached) else cached
+
+    timestamps, prices = series_arrays(hist)
+    packed = encode_arrays(timestamps, prices * table["rates"].get(currency, 1.0))
+    cache.set(cache_key, packed, settings.FX_REFRESH_SECONDS)
+    return PackedSeries(packed)
@@ -0,0 +1,85 @@
+"""
+Price history for one asset and period, from the best source available:
+the shared series store, CoinGecko (cached packed for an hour), or
+imported history.
+"""
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+
+from monitoring.metrics import cache_get, upstream_request
+from .assets import COINGECKO_IDS, PERIOD_DAY_MAP
+from .codec import PackedSeries, encode_series, is_packed
+from .fx import convert_history
+from .history_import import imported_history
+from .series_store import reader as series_reader
+
+
+logger = logging.getLogger(__name__)
+
+
+def fetch_history_coingecko(asset, period):
+    """Fetch OHLC-style historical prices from CoinGecko with full caching + fallback."""
+    if asset not in COINGECKO_IDS:
+        return None
+
+    cache_key = f"cg_hist_{asset}_{period}"
+    cached = cache_get("cg_hist", cache_key)
+    if cached:
+        # USE CACHED (decoded lazily, only if the caller reads the points)
+        return PackedSeries(cached) if is_packed(cached) else cached
+
+    formatted = download_history_coingecko(asset, period)
+    if formatted:
+        cache.set(cache_key, encode_series(formatted), 3600)  # cache 1h
+
+    return formatted
+
+
+def download_history_coingecko(asset, period):
+    """Uncached CoinGecko market_chart call; returns [[ts_ms, price], ...] or None."""
+    coin_id = COINGECKO_IDS.get(asset)
+    if not coin_id:
+        return None
+
+    days = PERIOD_DAY_MAP.get(period, 7)
+    url = f"{settings.COINGECKO_API_URL}/coins/{coin_id}/market_chart"
+    params = {"vs_currency": "usd", "days": days}
+
+    try:
+        resp = upstream_request("coingecko", "GET", url, params=params, timeout=10)
+
+        if resp.status_code == 429:
+            logger.warning(f"RATE LIMITED for {asset} {period}")
+            return None
+
+        if resp.status_code != 200:
+            logger.warning(f"CG returned {resp.status_code} for {asset} {period}")
+            return None
+
+        data = resp.json()
+        prices = data.get("prices", [])
+
+        return [[p[0], float(p[1])] for p in prices]
+
+    except Exception as e:
+        logger.error(f"Error fetching {asset} {period}: {e}")
+        return None
+
+
+def load_history(asset, period, currency="USD"):
+    """
+    Price series for one asset and period: sliced from the shared series
+    store when its writer is running, otherwise fetched from CoinGecko, and
+    as a last resort read from imported history (see import_history).
+    Converted from USD when the user quotes in another currency.
+    """
+    hist = None
+    if settings.SERIES_STORE_ENABLED:
+        hist = series_reader.read(asset, period, PERIOD_DAY_MAP.get(period, 7))
+    if not hist:
+        hist = fetch_history_coingecko(asset, period)
+    if not hist:
+        hist = imported_history(asset, period, PERIOD_DAY_MAP.get(period, 7))
+    return convert_history(asset, period, hist, currency)
@@ -0,0 +1,234 @@
+"""
+Bulk import of historical prices from CSV or Parquet dumps into PriceTick.
+
+Files are read in chunks of `chunk_size` rows with columns `timestamp`
+(unix seconds, unix ms or ISO 8601), `price` (USD) and `asset` (or one
+asset for the whole file). On PostgreSQL each chunk is COPYed into a
+temporary staging table and moved over with one
+INSERT ... ON CONFLICT (asset, timestamp) DO NOTHING. Other backends use
+bulk_create(ignore_conflicts=True). Either way rows already stored are
+skipped, so re-importing overlapping dumps is safe.
+
+Every chunk commits together with its HistoryImport checkpoint. An
+interrupted import therefore resumes after the last committed chunk.
+
+Imported ticks reach the charts two ways. The series writer seeds the
+store's empty buckets from them (seed_store) when it starts and after each
+finished import, so imported history shows up next to live data. And
+load_history reads them directly when neither the store nor CoinGecko can
+serve a period.
+"""
+import csv
+import os
+import time
+from datetime import datetime, timezone
+from itertools import islice
+from pathlib import Path
+
+from django.db import connection, transaction
+from django.db.models import Avg, F, Max
+from django.utils import timezone as django_timezone
+
+from .models import HistoryImport, PriceTick
+from .series_store import PERIOD_RESOLUTION, RESOLUTIONS
+
+
+FORMATS = ["csv", "parquet"]
+STAGE_TABLE = "dashboard_pricetick_stage"
+
+
+class ImportFormatError(ValueError):
+    """The file doesn't have the columns or values an import needs."""
+
+
+def detect_format(path):
+    return "parquet" if Path(path).suffix.lower() in (".parquet", ".pq") else "csv"
+
+
+def to_ms(value):
+    """Unix ms from unix seconds, unix ms or an ISO 8601 string."""
+    if isinstance(value, datetime):
+        moment = value
+    else:
+        try:
+            number = float(value)
+        except (TypeError, ValueError):
+            try:
+                moment = datetime.fromisoformat(str(value).strip().replace("Z", "+00:00"))
+            except ValueError:
+                raise ImportFormatError(f"unreadable timestamp {value!r}")
+        else:
+            # Seconds stay below 1e11 until the year 5138
+            return int(number * 1000) if number < 1e11 else int(number)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return int(moment.timestamp() * 1000)
+
+
+def _csv_rows(path):
+    with open(path, newline="") as f:
+        reader = csv.DictReader(f)
+        yield from ((row.get("asset"), row.get("timestamp"), row.get("price")) for row in reader)
+
+
+def _parquet_rows(path, chunk_size):
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportFormatError("reading Parquet needs pyarrow (pip install pyarrow)")
+    parquet = pq.ParquetFile(path)
+    columns = [c for c in ("asset", "timestamp", "price") if c in parquet.schema_arrow.names]
+    for batch in parquet.iter_batches(batch_size=chunk_size, columns=columns):
+        data = batch.to_pydict()
+        assets = data.get("asset") or [None] * batch.num_rows
+        yield from zip(assets, data.get("timestamp", []), data.get("price", []))
+
+
+def read_rows(path, fmt, asset=None, chunk_size=100_000):
+    """Yield (asset, ts_ms, price) tuples from a dump."""
+    raw = _parquet_rows(path, chunk_size) if fmt == "parquet" else _csv_rows(path)
+    for line, (row_asset, ts, price) in enumerate(raw, start=1):
+        row_asset = (row_asset or asset or "").upper()
+        if not row_asset:
+            raise ImportFormatError(f"row {line}: no asset column and no --asset given")
+        if ts is None or price in (None, ""):
+            raise ImportFormatError(f"row {line}: needs timestamp and price columns")
+        yield row_asset, to_ms(ts), float(price)
+
+
+def _copy_chunk(rows):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"CREATE TEMP TABLE IF NOT EXISTS {STAGE_TABLE} "
+            "(asset varchar(10), timestamp bigint, price double precision) ON COMMIT DELETE ROWS"
+        )
+        with cursor.copy(f"COPY {STAGE_TABLE} (asset, timestamp, price) FROM STDIN") as copy:
+            for row in rows:
+                copy.write_row(row)
+        cursor.execute(
+            f"INSERT INTO {PriceTick._meta.db_table} (asset, timestamp, price) "
+            f"SELECT asset, timestamp, price FROM {STAGE_TABLE} "
+            "ON CONFLICT (asset, timestamp) DO NOTHING"
+        )
+        return cursor.rowcount
+
+
+def _stored_pairs(rows):
+    """How many of the chunk's (asset, timestamp) pairs are already stored."""
+    by_asset = {}
+    for asset, ts, _ in rows:
+        by_asset.setdefault(asset, set()).add(ts)
+    stored = 0
+    for asset, timestamps in by_asset.items():
+        # One indexed range scan per asset instead of an IN list the size of the chunk
+        in_range = PriceTick.objects.filter(
+            asset=asset, timestamp__gte=min(timestamps), timestamp__lte=max(timestamps),
+        ).values_list("timestamp", flat=True)
+        stored += sum(1 for ts in in_range.iterator() if ts in timestamps)
+    return stored
+
+
+def _bulk_create_chunk(rows, batch_size=5000):
+    # bulk_create(ignore_conflicts=True) doesn't report what it skipped, so
+    # count the pairs that will be skipped first; rows are unique by now
+    skipped = _stored_pairs(rows)
+    PriceTick.objects.bulk_create(
+        (PriceTick(asset=asset, timestamp=ts, price=price) for asset, ts, price in rows),
+        batch_size=batch_size,
+        ignore_conflicts=True,
+    )
+    return len(rows) - skipped
+
+
+def load_chunk(rows):
+    """Store one chunk, skipping (asset, timestamp) pairs already present. Returns rows inserted."""
+    # Repeats within the chunk are dropped here, which is much cheaper than
+    # DISTINCT ON in SQL; the first row for a pair wins, as with stored rows
+    unique = {}
+    for asset, ts, price in rows:
+        unique.setdefault((asset, ts), price)
+    rows = [(asset, ts, price) for (asset, ts), price in unique.items()]
+    if connection.vendor == "postgresql":
+        return _copy_chunk(rows)
+    return _bulk_create_chunk(rows)
+
+
+def import_file(path, fmt=None, asset=None, chunk_size=100_000, restart=False, progress=None):
+    """
+    Import one dump, resuming from its checkpoint unless `restart`. Calls
+    progress(checkpoint) after every committed chunk. Returns the checkpoint.
+    """
+    path = str(Path(path).resolve())
+    fmt = fmt or detect_format(path)
+    stat = os.stat(path)
+    fingerprint = f"{stat.st_size}-{stat.st_mtime_ns}"
+
+    checkpoint, _ = HistoryImport.objects.get_or_create(source=path, defaults={"fingerprint": fingerprint})
+    if restart or checkpoint.fingerprint != fingerprint:
+        checkpoint.fingerprint = fingerprint
+        checkpoint.rows_done = checkpoint.rows_inserted = 0
+        checkpoint.finished_at = None
+        checkpoint.save()
+    if checkpoint.finished_at:
+        return checkpoint
+
+    rows = islice(read_rows(path, fmt, asset, chunk_size), checkpoint.rows_done, None)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            break
+        with transaction.atomic():
+            inserted = load_chunk(chunk)
+            checkpoint.rows_done += len(chunk)
+            checkpoint.rows_inserted += inserted
+            checkpoint.save(update_fields=["rows_done", "rows_inserted", "updated_at"])
+        if progress:
+            progress(checkpoint)
+
+    checkpoint.finished_at = django_timezone.now()
+    checkpoint.save(update_fields=["finished_at", "updated_at"])
+    return checkpoint
+
+
+def imported_buckets(asset, step_s, since_ms):
+    """[[bucket start ms, average price], ...] of imported ticks after `since_ms`, per `step_s` bucket."""
+    step_ms = step_s * 1000
+    buckets = (
+        PriceTick.objects.filter(asset=asset, timestamp__gt=since_ms)
+        .annotate(bucket=F("timestamp") / step_ms)
+        .values("bucket")
+        .annotate(price=Avg("price"))
+        .order_by("bucket")
+    )
+    return [[row["bucket"] * step_ms, float(row["price"])] for row in buckets]
+
+
+def imported_history(asset, period, days):
+    """
+    [[ts_ms, price], ...] of imported ticks over the last `days` days, one
+    average per bucket of the period's series-store resolution. None if
+    nothing was imported for that range.
+    """
+    step_s = RESOLUTIONS[PERIOD_RESOLUTION.get(period, "1h")][0]
+    points = imported_buckets(asset, step_s, int(time.time() * 1000) - days * 86_400_000)
+    return points or None
+
+
+def seed_store(writer):
+    """
+    Fill the series store's empty buckets, at every resolution, from
+    imported ticks. Buckets the writer already polled are left alone.
+    Returns the number of buckets filled.
+    """
+    now_ms = int(time.time() * 1000)
+    filled = 0
+    for asset in PriceTick.objects.values_list("asset", flat=True).distinct():
+        for resolution, (step_s, capacity) in RESOLUTIONS.items():
+            points = imported_buckets(asset, step_s, now_ms - step_s * capacity * 1000)
+            filled += writer.fill(asset, resolution, points)
+    return filled
+
+
+def last_import_finished():
+    """When the most recent import finished, or None."""
+    return HistoryImport.objects.aggregate(latest=Max("finished_at"))["latest"]
@@ -0,0 +1,168 @@
+"""
+Vectorized technical indicators over cached price series.
+
+Everything is computed with NumPy array operations; the only Python-level
+loop is EMA's block recursion, which runs once per few hundred points.
+Results are memoized in the cache per (asset, period,
+data version), so a series is only analysed again after it changes.
+"""
+import math
+import zlib
+
+import numpy as np
+from django.core.cache import cache
+
+from monitoring.metrics import cache_get
+from .codec import PackedSeries
+from .series_store import ArraySeries
+
+
+SMA_WINDOW = 20
+EMA_WINDOW = 20
+RSI_WINDOW = 14
+VOLATILITY_WINDOW = 20
+BAND_WINDOW = 20
+
+MS_PER_YEAR = 365 * 86_400_000
+
+
+def series_arrays(hist):
+    """(timestamps int64, prices float64) arrays for a cached or freshly fetched series."""
+    if isinstance(hist, (PackedSeries, ArraySeries)):
+        return hist.arrays()
+    data = np.asarray(hist, dtype=np.float64).reshape(-1, 2)
+    return data[:, 0].astype(np.int64), data[:, 1]
+
+
+def data_version(hist):
+    """Cheap fingerprint that changes whenever the series does."""
+    if isinstance(hist, PackedSeries):
+        return f"{zlib.crc32(hist.blob):08x}"
+    if isinstance(hist, ArraySeries):
+        # Any bucket can be rewritten in place, so hash all of them
+        return f"{zlib.crc32(hist.prices.tobytes(), zlib.crc32(hist.timestamps.tobytes())):08x}"
+    if not hist:
+        return "empty"
+    return f"{len(hist)}-{hist[0][0]}-{hist[-1][0]}-{hist[-1][1]!r}"
+
+
+def indicators_for(asset, period, hist):
+    """Memoized indicator summary for one asset/period series."""
+    cache_key = f"ind_{asset}_{period}_{data_version(hist)}"
+    cached = cache_get("indicators", cache_key)
+    if cached is not None:
+        return cached
+
+    timestamps, prices = series_arrays(hist)
+    summary = summarize(timestamps, prices)
+    cache.set(cache_key, summary, 3600)
+    return summary
+
+
+def summarize(timestamps, prices):
+    """
+    Latest value of every indicator for one series. Windowed statistics
+    only touch the last window of points, and the EMAs run over a tail long
+    enough to match the full-history value to float precision, so the cost
+    is independent of how much history the series holds.
+    """
+    n = len(prices)
+    if n < 2:
+        return None
+
+    step_ms = (timestamps[-1] - timestamps[0]) / (n - 1)
+    periods_per_year = MS_PER_YEAR / step_ms if step_ms > 0 else 0.0
+
+    tail = prices[-(VOLATILITY_WINDOW + 1):]
+    log_returns = np.log(tail[1:] / tail[:-1])
+    volatility = rolling_std(log_returns, VOLATILITY_WINDOW)
+    band = prices[-BAND_WINDOW:]
+
+    ema_alpha = 2 / (EMA_WINDOW + 1)
+    return {
+        "points": n,
+        "last": _round(prices[-1]),
+        "change_pct": _round((prices[-1] / prices[0] - 1) * 100),
+        "last_return_pct": _round((prices[-1] / prices[-2] - 1) * 100),
+        "volatility_pct": _round(volatility[-1] * math.sqrt(periods_per_year) * 100) if len(volatility) else None,
+        "sma": _round(sma(prices[-SMA_WINDOW:], SMA_WINDOW)[-1]) if n >= SMA_WINDOW else None,
+        "ema": _round(ema(_settled_tail(prices, ema_alpha), ema_alpha)[-1]),
+        "rsi": _round(rsi(_settled_tail(prices, 1 / RSI_WINDOW, extra=1), RSI_WINDOW)[-1]),
+        "support": _round(band.min()) if n >= BAND_WINDOW else None,
+        "resistance": _round(band.max()) if n >= BAND_WINDOW else None,
+        "low": _round(prices.min()),
+        "high": _round(prices.max()),
+    }
+
+
+def _settled_tail(values, alpha, extra=0):
+    """
+    The suffix of `values` an EMA needs: older points carry a weight below
+    1e-12 of the latest, so seeding at the suffix gives the same result.
+    """
+    if alpha >= 1:
+        return values[-(1 + extra):]
+    length = math.ceil(math.log(1e-12) / math.log(1 - alpha)) + extra
+    return values[-length:]
+
+
+def sma(values, window):
+    """Simple moving average; output[i] covers values[i : i + window]."""
+    csum = np.cumsum(np.concatenate(([0.0], values)))
+    return (csum[window:] - csum[:-window]) / window
+
+
+def rolling_std(values, window):
+    """Sample standard deviation over a sliding window, from running sums."""
+    if len(values) < window:
+        return np.empty(0)
+    # Center first so the sum-of-squares trick keeps its precision
+    centered = values - values.mean()
+    mean = sma(centered, window)
+    mean_sq = sma(centered * centered, window)
+    variance = np.maximum(mean_sq - mean * mean, 0.0) * window / (window - 1)
+    return np.sqrt(variance)
+
+
+def ema(values, alpha):
+    """
+    Exponential moving average seeded with the first value.
+
+    Within a block, y[i] = d^(i+1) * (y_prev + alpha * sum_j<=i x[j] / d^(j+1))
+    with d = 1 - alpha, which is a cumsum. Blocks are sized so d^-block stays
+    well inside float64 range, and carry y across block boundaries.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    out = np.empty_like(values)
+    if not len(values):
+        return out
+
+    decay = 1.0 - alpha
+    if decay <= 0:
+        out[:] = values
+        return out
+
+    block = max(1, int(30 / -math.log(decay)))
+    powers = decay ** np.arange(1, block + 1)
+    previous = values[0]
+    for start in range(0, len(values), block):
+        chunk = values[start:start + block]
+        p = powers[:len(chunk)]
+        out[start:start + len(chunk)] = p * (previous + alpha * np.cumsum(chunk / p))
+        previous = out[start + len(chunk) - 1]
+    return out
+
+
+def rsi(prices, window):
+    """Wilder's relative strength index."""
+    deltas = np.diff(prices)
+    gains = ema(np.maximum(deltas, 0.0), 1 / window)
+    losses = ema(np.maximum(-deltas, 0.0), 1 / window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        strength = gains / losses
+    return np.where(losses == 0, 100.0, 100 - 100 / (1 + strength))
+
+
+def _round(value):
+    value = float(value)
+    return round(value, 6) if math.isfinite(value) else None
@@ -0,0 +1,93 @@
+"""
+In-process price fan-out for the live stream.
+
+One PriceFeed per worker polls the upstream for every supported asset and
+pushes each change to all connected subscribers. The number of upstream
+calls depends only on the poll interval, not on how many clients are
+connected. The poller runs as a task on the worker's event loop. It starts
+with the first subscriber and stops after the last one leaves.
+
+Each subscriber gets a bounded queue. When a slow client falls behind, the
+oldest pending event is dropped to make room, so memory per connection stays
+fixed and one stalled socket never blocks the others.
+"""
+import asyncio
+import logging
+import time
+
+from monitoring.metrics import LIVE_DROPPED_EVENTS, LIVE_SUBSCRIBERS
+
+
+logger = logging.getLogger(__name__)
+
+
+class Subscriber:
+    __slots__ = ("assets", "queue")
+
+    def __init__(self, assets, queue_size):
+        self.assets = frozenset(assets)
+        self.queue = asyncio.Queue(maxsize=queue_size)
+
+    def push(self, event):
+        if self.queue.full():
+            self.queue.get_nowait()
+            LIVE_DROPPED_EVENTS.inc()
+        self.queue.put_nowait(event)
+
+
+class PriceFeed:
+    """
+    `fetch` is a blocking callable returning {asset: price}; it runs in a
+    thread so the event loop keeps serving connections while it waits.
+    """
+
+    def __init__(self, fetch, interval, queue_size):
+        self.fetch = fetch
+        self.interval = interval
+        self.queue_size = queue_size
+        self.latest = {}
+        self.updated_at = 0
+        self._subscribers = set()
+        self._task = None
+
+    def subscribe(self, assets):
+        subscriber = Subscriber(assets, self.queue_size)
+        self._subscribers.add(subscriber)
+        LIVE_SUBSCRIBERS.inc()
+
+        # New clients get the current snapshot without waiting for the next change
+        snapshot = {a: p for a, p in self.latest.items() if a in subscriber.assets}
+        if snapshot:
+            subscriber.push((self.updated_at, snapshot))
+
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._poll())
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        if subscriber in self._subscribers:
+            self._subscribers.discard(subscriber)
+            LIVE_SUBSCRIBERS.dec()
+
+    def publish(self, prices):
+        """Fan the assets whose price changed out to every interested subscriber."""
+        changed = {a: p for a, p in prices.items() if self.latest.get(a) != p}
+        if not changed:
+            return
+        self.latest.update(changed)
+        self.updated_at = int(time.time() * 1000)
+
+        for subscriber in self._subscribers:
+            event = {a: p for a, p in changed.items() if a in subscriber.assets}
+            if event:
+                subscriber.push((self.updated_at, event))
+
+    async def _poll(self):
+        while self._subscribers:
+            try:
+                prices = await asyncio.to_thread(self.fetch)
+                if prices:
+                    self.publish(prices)
+            except Exception as e:
+                logger.warning(f"Live price poll failed: {e}")
+            await asyncio.sleep(self.interval)
@@ -0,0 +1,39 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from dashboard.history_import import FORMATS, ImportFormatError, import_file
+
+
+class Command(BaseCommand):
+    help = "Bulk-load historical USD prices from CSV or Parquet dumps; interrupted imports resume where they stopped."
+
+    def add_arguments(self, parser):
+        parser.add_argument("paths", nargs="+", help="Dump files with timestamp, price and (unless --asset) asset columns")
+        parser.add_argument("--format", choices=FORMATS, help="File format (default: from the extension)")
+        parser.add_argument("--asset", help="Asset for files without an asset column, e.g. BTC")
+        parser.add_argument("--chunk-size", type=int, default=100_000, help="Rows per committed chunk (default 100000)")
+        parser.add_argument("--restart", action="store_true", help="Ignore saved progress and import from the first row")
+
+    def handle(self, *args, **options):
+        for path in options["paths"]:
+            started = time.monotonic()
+
+            def progress(checkpoint):
+                rate = checkpoint.rows_done / max(time.monotonic() - started, 1e-9)
+                self.stdout.write(f"{path}: {checkpoint.rows_done} rows read, {checkpoint.rows_inserted} new ({rate:,.0f} rows/s)")
+
+            try:
+                checkpoint = import_file(
+                    path,
+                    fmt=options["format"],
+                    asset=options["asset"],
+                    chunk_size=options["chunk_size"],
+                    restart=options["restart"],
+                    progress=progress,
+                )
+            except (OSError, ImportFormatError) as e:
+                raise CommandError(f"{path}: {e}")
+            self.stdout.write(self.style.SUCCESS(
+                f"{path}: done, {checkpoint.rows_done} rows read, {checkpoint.rows_inserted} new"
+            ))
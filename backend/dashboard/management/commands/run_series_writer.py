@@ -0,0 +1,53 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from dashboard.series_store import RESOLUTION_SOURCE, SeriesWriter
+from dashboard.assets import COINGECKO_IDS
+from dashboard.history import download_history_coingecko
+from dashboard.history_import import last_import_finished, seed_store
+
+
+class Command(BaseCommand):
+    help = "Poll CoinGecko and keep the shared memory-mapped price store up to date (run exactly one)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--periods", nargs="+", default=["1d", "30d", "1y"], choices=sorted(set(RESOLUTION_SOURCE.values())),
+            help="market_chart periods to poll; 1d feeds 5m buckets, 30d hourly, 1y daily",
+        )
+        parser.add_argument("--interval", type=float, default=300, help="Seconds between polls (default 300)")
+        parser.add_argument("--pause", type=float, default=2.0, help="Seconds between upstream calls (default 2)")
+        parser.add_argument("--once", action="store_true", help="Poll once and exit")
+
+    def handle(self, *args, **options):
+        try:
+            writer = SeriesWriter()
+        except RuntimeError as e:
+            raise CommandError(str(e))
+
+        seeded = None
+        try:
+            while True:
+                started = time.monotonic()
+                # Imported history fills the buckets polling hasn't; again after every new import
+                finished = last_import_finished()
+                if finished is not None and finished != seeded:
+                    self.stdout.write(f"Seeded {seed_store(writer)} bucket(s) from imported history")
+                    seeded = finished
+
+                for asset in COINGECKO_IDS:
+                    for period in options["periods"]:
+                        points = download_history_coingecko(asset, period)
+                        if points:
+                            updated = writer.ingest(asset, period, points)
+                            self.stdout.write(f"{asset} {period}: {len(points)} points -> {updated} resolution(s)")
+                        else:
+                            self.stderr.write(f"{asset} {period}: no data")
+                        time.sleep(options["pause"])
+
+                if options["once"]:
+                    break
+                time.sleep(max(0.0, options["interval"] - (time.monotonic() - started)))
+        finally:
+            writer.close()
@@ -0,0 +1,129 @@
+"""
+Market snapshot from a single CoinGecko /coins/markets call.
+
+One request with sparkline=true returns price, 24h change, 24h volume and a
+7-day hourly sparkline for every supported asset at once. The USD snapshot
+is cached for MARKET_SNAPSHOT_TTL and shared by every user. Quote-currency
+conversion happens locally, like everywhere else (see fx.py). A copy of the
+last good snapshot outlives the TTL, so an upstream outage serves slightly
+stale data rather than nothing.
+"""
+import logging
+import time
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+
+from monitoring import admission
+from monitoring.metrics import cache_get, upstream_request
+from .fx import rate_for
+
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_KEY = "market_snapshot"
+LAST_GOOD_KEY = "market_snapshot_last_good"
+# Set while coins/markets is failing and there is no snapshot to fall back on
+FAILED_KEY = "market_snapshot_failed"
+FAILURE_TTL = 30
+
+
+def market_snapshot(coingecko_ids):
+    """
+    {"as_of": unix seconds, "assets": {asset: {...}}} in USD for every asset
+    in `coingecko_ids` ({asset: coingecko id}), or None if there has never
+    been a successful fetch.
+    """
+    snapshot = cache_get("markets", SNAPSHOT_KEY)
+    if snapshot is not None:
+        return snapshot
+    if cache.get(FAILED_KEY):
+        return None
+
+    snapshot = download_snapshot(coingecko_ids)
+    if snapshot is not None:
+        cache.set(SNAPSHOT_KEY, snapshot, settings.MARKET_SNAPSHOT_TTL)
+        cache.set(LAST_GOOD_KEY, snapshot, 86400)
+        cache.delete(FAILED_KEY)
+        return snapshot
+
+    snapshot = cache.get(LAST_GOOD_KEY)
+    if not admission.is_shed():
+        # Don't hammer the upstream while it's failing (a shed request never reached it).
+        # Without a snapshot, remember the failure, or every caller would retry
+        # coins/markets before its own fallback call
+        if snapshot is not None:
+            cache.set(SNAPSHOT_KEY, snapshot, FAILURE_TTL)
+        else:
+            cache.set(FAILED_KEY, True, FAILURE_TTL)
+    return snapshot
+
+
+def snapshot_version(coingecko_ids):
+    """Changes whenever a new snapshot is fetched."""
+    snapshot = market_snapshot(coingecko_ids)
+    return snapshot["as_of"] if snapshot else "none"
+
+
+def download_snapshot(coingecko_ids):
+    """Uncached /coins/markets call for all assets."""
+    assets_by_id = {coin_id: asset for asset, coin_id in coingecko_ids.items()}
+    try:
+        resp = upstream_request(
+            "coingecko",
+            "GET",
+            f"{settings.COINGECKO_API_URL}/coins/markets",
+            params={
+                "vs_currency": "usd",
+                "ids": ",".join(assets_by_id),
+                "sparkline": "true",
+                "price_change_percentage": "24h",
+            },
+            timeout=5,
+        )
+        if resp.status_code != 200:
+            logger.warning(f"CG coins/markets returned {resp.status_code}")
+            return None
+
+        assets = {}
+        for row in resp.json():
+            asset = assets_by_id.get(row.get("id"))
+            if asset is None or row.get("current_price") is None:
+                continue
+            assets[asset] = {
+                "price": float(row["current_price"]),
+                "change_24h": float(row.get("price_change_percentage_24h") or 0.0),
+                "volume_24h": float(row.get("total_volume") or 0.0),
+                "sparkline": [float(p) for p in (row.get("sparkline_in_7d") or {}).get("price") or []],
+            }
+        if not assets:
+            return None
+        return {"as_of": int(time.time()), "assets": assets}
+
+    except Exception as e:
+        logger.error(f"Error fetching market snapshot: {e}")
+        return None
+
+
+def snapshot_prices(snapshot, assets):
+    """{asset: usd_price} for the requested assets present in the snapshot."""
+    return {asset: snapshot["assets"][asset]["price"] for asset in assets if asset in snapshot["assets"]}
+
+
+def convert_snapshot(snapshot, assets, currency):
+    """The requested assets, with prices, volumes and sparklines in `currency`."""
+    rate = rate_for(currency)
+    converted = {}
+    for asset in assets:
+        entry = snapshot["assets"].get(asset)
+        if entry is None:
+            continue
+        # Percent change is the same in every currency
+        converted[asset] = {
+            "price": entry["price"] * rate,
+            "change_24h": entry["change_24h"],
+            "volume_24h": entry["volume_24h"] * rate,
+            "sparkline": (np.asarray(entry["sparkline"]) * rate).tolist(),
+        }
+    return converted
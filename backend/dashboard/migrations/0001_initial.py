@@ -0,0 +1,38 @@
+# Generated by Django 5.1.4 on 2026-10-19 13:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NewsItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('url', models.URLField(max_length=1000, unique=True)),
+                ('title', models.CharField(max_length=500)),
+                ('source', models.CharField(max_length=200)),
+                ('published_at', models.DateTimeField(blank=True, null=True)),
+                ('ingested_at', models.DateTimeField(auto_now_add=True)),
+                ('cluster', models.CharField(blank=True, max_length=16)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='NewsItemAsset',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('asset', models.CharField(max_length=10)),
+                ('news', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='assets', to='dashboard.newsitem')),
+            ],
+            options={
+                'unique_together': {('asset', 'news')},
+            },
+        ),
+    ]
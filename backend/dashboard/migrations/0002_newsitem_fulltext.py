@@ -0,0 +1,69 @@
+from django.db import migrations
+
+
+POSTGRES_FORWARD = [
+    """
+    ALTER TABLE dashboard_newsitem
+    ADD COLUMN search tsvector GENERATED ALWAYS AS (to_tsvector('english', title)) STORED
+    """,
+    "CREATE INDEX dashboard_newsitem_search_gin ON dashboard_newsitem USING GIN (search)",
+]
+
+POSTGRES_REVERSE = [
+    "DROP INDEX IF EXISTS dashboard_newsitem_search_gin",
+    "ALTER TABLE dashboard_newsitem DROP COLUMN IF EXISTS search",
+]
+
+# External-content FTS5 table: stores only the index, rows stay in dashboard_newsitem.
+# The porter tokenizer stems like Postgres' english config does.
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE dashboard_newsitem_fts
+    USING fts5(title, content='dashboard_newsitem', content_rowid='id', tokenize='porter unicode61')
+    """,
+    """
+    CREATE TRIGGER dashboard_newsitem_fts_insert AFTER INSERT ON dashboard_newsitem BEGIN
+        INSERT INTO dashboard_newsitem_fts(rowid, title) VALUES (new.id, new.title);
+    END
+    """,
+    """
+    CREATE TRIGGER dashboard_newsitem_fts_delete AFTER DELETE ON dashboard_newsitem BEGIN
+        INSERT INTO dashboard_newsitem_fts(dashboard_newsitem_fts, rowid, title) VALUES ('delete', old.id, old.title);
+    END
+    """,
+    """
+    CREATE TRIGGER dashboard_newsitem_fts_update AFTER UPDATE OF title ON dashboard_newsitem BEGIN
+        INSERT INTO dashboard_newsitem_fts(dashboard_newsitem_fts, rowid, title) VALUES ('delete', old.id, old.title);
+        INSERT INTO dashboard_newsitem_fts(rowid, title) VALUES (new.id, new.title);
+    END
+    """,
+    "INSERT INTO dashboard_newsitem_fts(dashboard_newsitem_fts) VALUES ('rebuild')",
+]
+
+SQLITE_REVERSE = [
+    "DROP TRIGGER IF EXISTS dashboard_newsitem_fts_insert",
+    "DROP TRIGGER IF EXISTS dashboard_newsitem_fts_delete",
+    "DROP TRIGGER IF EXISTS dashboard_newsitem_fts_update",
+    "DROP TABLE IF EXISTS dashboard_newsitem_fts",
+]
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        for statement in statements_by_vendor.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            _run({'postgresql': POSTGRES_FORWARD, 'sqlite': SQLITE_FORWARD}),
+            _run({'postgresql': POSTGRES_REVERSE, 'sqlite': SQLITE_REVERSE}),
+        ),
+    ]
@@ -0,0 +1,63 @@
+from django.conf import settings
+from django.db import models
+
+
+class NewsItem(models.Model):
+    """
+    Archived CryptoPanic headline. The full-text index over `title` is
+    created by migration: a generated tsvector column with a GIN index on
+    Postgres, an FTS5 table kept in sync by triggers on SQLite.
+    """
+    url = models.URLField(max_length=1000, unique=True)
+    title = models.CharField(max_length=500)
+    source = models.CharField(max_length=200)
+    published_at = models.DateTimeField(null=True, blank=True)
+    ingested_at = models.DateTimeField(auto_now_add=True)
+    # Near-duplicate cluster (see news_dedup.py)
+    cluster = models.CharField(max_length=16, blank=True)
+
+
+class NewsItemAsset(models.Model):
+    """Asset mentioned by a news item; lets asset filters use an index instead of scanning titles."""
+    news = models.ForeignKey(NewsItem, on_delete=models.CASCADE, related_name='assets')
+    asset = models.CharField(max_length=10)
+
+    class Meta:
+        unique_together = ['asset', 'news']
+
+
+class PriceTick(models.Model):
+    """
+    Imported historical USD price (see the import_history command). Read
+    when neither the series store nor CoinGecko can serve a period. The
+    unique (asset, timestamp) index deduplicates imports and serves range scans.
+    """
+    asset = models.CharField(max_length=10)
+    timestamp = models.BigIntegerField()  # unix ms
+    price = models.FloatField()
+
+    class Meta:
+        unique_together = ['asset', 'timestamp']
+
+
+class HistoryImport(models.Model):
+    """Progress of one import_history source file, so an interrupted import resumes where it stopped."""
+    source = models.CharField(max_length=1000, unique=True)
+    # Size and mtime of the file when the import started; a changed file starts over
+    fingerprint = models.CharField(max_length=100)
+    rows_done = models.BigIntegerField(default=0)
+    rows_inserted = models.BigIntegerField(default=0)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+
+class StreamTicket(models.Model):
+    """
+    Single-use ticket for opening the price stream (see views.stream_ticket).
+    Kept in the database rather than the cache: tickets are issued by the
+    WSGI workers and redeemed by separate ASGI workers, which don't share a
+    per-process cache. Only a hash of the ticket is stored.
+    """
+    key = models.CharField(max_length=64, unique=True)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    expires_at = models.DateTimeField(db_index=True)
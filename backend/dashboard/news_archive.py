@@ -0,0 +1,147 @@
+"""
+Archive of ingested CryptoPanic headlines and full-text search over it.
+
+Every news fetch stores the new items with the assets they mention in a
+side table, so asset filters are index lookups. Title search uses the
+database's own full-text index (see migration 0002): websearch_to_tsquery
+against a GIN-indexed tsvector on Postgres, FTS5 MATCH on SQLite. Results
+page by id with a keyset cursor, so deep pages cost the same as the first.
+"""
+import logging
+import re
+import zlib
+
+from django.core.cache import cache
+from django.db import DatabaseError, connection, transaction
+from django.utils.dateparse import parse_datetime
+
+from monitoring.metrics import cache_get
+from .models import NewsItem, NewsItemAsset
+from .news_dedup import cluster_for
+
+
+logger = logging.getLogger(__name__)
+
+ASSET_KEYWORDS = {
+    "BTC": ["bitcoin", "btc"],
+    "ETH": ["ethereum", "eth"],
+    "SOL": ["solana", "sol"],
+}
+_ASSET_PATTERNS = {
+    asset: re.compile(r"\b(?:" + "|".join(keywords) + r")\b", re.IGNORECASE)
+    for asset, keywords in ASSET_KEYWORDS.items()
+}
+
+
+def article_url(item):
+    """Prefer item["url"], then source["url"], last resort is CryptoPanic search."""
+    source_obj = item.get("source") or {}
+    url = item.get("url") or source_obj.get("url")
+    if not url:
+        url = f"https://cryptopanic.com/search?q={'+'.join(item.get('title', '').split()[:4])}"
+    return url
+
+
+def mentioned_assets(item):
+    """Assets tagged by CryptoPanic, or else named in the title."""
+    tagged = {c.get("code") for c in item.get("currencies") or [] if c.get("code") in ASSET_KEYWORDS}
+    if tagged:
+        return tagged
+    title = item.get("title", "")
+    return {asset for asset, pattern in _ASSET_PATTERNS.items() if pattern.search(title)}
+
+
+def archive_news(results):
+    """
+    Store new items from a CryptoPanic response and return each item's
+    near-duplicate cluster, in order. A response that was already archived
+    is recognised by its URLs and costs one cache lookup.
+    """
+    urls = [article_url(item) for item in results]
+    batch_key = f"news_archived_{zlib.crc32(chr(0).join(urls).encode()):08x}"
+    clusters = cache_get("news_archive", batch_key)
+    if clusters is not None:
+        return clusters
+
+    clusters = [cluster_for(item.get("title", ""), url) for item, url in zip(results, urls)]
+    try:
+        _store(results, urls, clusters)
+    except DatabaseError as e:
+        logger.error(f"Could not archive news: {e}")
+        return clusters
+
+    cache.set(batch_key, clusters, 3600)
+    return clusters
+
+
+def _store(results, urls, clusters):
+    existing = set(NewsItem.objects.filter(url__in=urls).values_list("url", flat=True))
+    items, assets = [], []
+    for item, url, cluster in zip(results, urls, clusters):
+        title = (item.get("title") or "").strip()
+        if not title or url in existing:
+            continue
+        existing.add(url)
+        items.append(NewsItem(
+            url=url,
+            title=title[:500],
+            source=((item.get("source") or {}).get("title") or "CryptoPanic")[:200],
+            published_at=parse_datetime(item.get("published_at") or ""),
+            cluster=cluster,
+        ))
+        assets.append(mentioned_assets(item))
+
+    if not items:
+        return
+    with transaction.atomic():
+        # Another worker may archive some of the same items first; skip just those
+        NewsItem.objects.bulk_create(items, ignore_conflicts=True)
+        ids = dict(NewsItem.objects.filter(url__in=[item.url for item in items]).values_list("url", "id"))
+        NewsItemAsset.objects.bulk_create(
+            [
+                NewsItemAsset(news_id=ids[item.url], asset=asset)
+                for item, news_assets in zip(items, assets)
+                for asset in news_assets
+            ],
+            ignore_conflicts=True,
+        )
+
+
+def _fts5_query(query):
+    # Quote every word so user input can't use FTS5 operators; words are ANDed
+    words = re.findall(r"\w+", query)
+    return " ".join(f'"{word}"' for word in words) or None
+
+
+def search(query=None, assets=None, cursor=None, limit=20):
+    """
+    Newest-first archive page matching `query` and any of `assets`.
+    Returns (items, next_cursor); next_cursor is None on the last page.
+    """
+    queryset = NewsItem.objects.order_by("-id")
+
+    if query:
+        if connection.vendor == "postgresql":
+            queryset = queryset.extra(
+                where=["search @@ websearch_to_tsquery('english', %s)"],
+                params=[query],
+            )
+        elif connection.vendor == "sqlite" and _fts5_query(query):
+            queryset = queryset.extra(
+                where=[
+                    "dashboard_newsitem.id IN (SELECT rowid FROM dashboard_newsitem_fts "
+                    "WHERE dashboard_newsitem_fts MATCH %s)"
+                ],
+                params=[_fts5_query(query)],
+            )
+        else:
+            queryset = queryset.filter(title__icontains=query)
+
+    if assets:
+        queryset = queryset.filter(id__in=NewsItemAsset.objects.filter(asset__in=assets).values("news_id"))
+    if cursor:
+        queryset = queryset.filter(id__lt=cursor)
+
+    items = list(queryset[:limit + 1])
+    next_cursor = items[limit - 1].id if len(items) > limit else None
+    return items[:limit], next_cursor
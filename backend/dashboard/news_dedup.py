@@ -0,0 +1,98 @@
+"""
+Near-duplicate headline clustering with MinHash and LSH.
+
+A title is normalized to lowercase words and shingled into words and word
+pairs. Its MinHash signature is SIGNATURE_SIZE minimums of random affine
+hashes, all computed in one NumPy pass. Two signatures agree in a given position with
+probability equal to the Jaccard similarity of the two shingle sets.
+
+The signature is cut into BANDS bands of ROWS values, and each band maps
+to a cache key that names the cluster first seen with that band. A new
+title costs one get_many over its bands plus one for the candidates'
+signatures, whatever the size of the archive. It joins the most similar
+candidate at or above SIMILARITY_THRESHOLD, or else starts its own
+cluster. Clusters live in the shared cache, so every worker agrees on them.
+"""
+import re
+import zlib
+
+import numpy as np
+from django.core.cache import cache
+
+
+SIGNATURE_SIZE = 64
+BANDS = 16
+ROWS = SIGNATURE_SIZE // BANDS
+# With 16 bands of 4 rows, titles around this similarity start colliding
+SIMILARITY_THRESHOLD = 0.5
+
+CLUSTER_TTL = 2 * 86400
+
+_PRIME = (1 << 31) - 1
+_rng = np.random.default_rng(20240601)
+_A = _rng.integers(1, _PRIME, SIGNATURE_SIZE, dtype=np.uint64)[:, None]
+_B = _rng.integers(0, _PRIME, SIGNATURE_SIZE, dtype=np.uint64)[:, None]
+
+_WORD = re.compile(r"[a-z0-9$]+")
+_STOPWORDS = frozenset("a an and are as at be by for from has have in is it its of on or the to with".split())
+
+
+def shingles(title):
+    """Words plus word pairs: pairs keep some order, words tolerate rewording."""
+    words = [w for w in _WORD.findall(title.lower()) if w not in _STOPWORDS]
+    return set(words) | {f"{a} {b}" for a, b in zip(words, words[1:])}
+
+
+def signature(title):
+    """MinHash signature (SIGNATURE_SIZE uint32 values) of a title."""
+    tokens = shingles(title)
+    if not tokens:
+        return None
+    hashes = np.fromiter((zlib.crc32(t.encode()) for t in tokens), dtype=np.uint64, count=len(tokens))
+    # a < 2^31 and hash < 2^32, so a * hash + b stays inside uint64
+    return ((_A * hashes + _B) % _PRIME).min(axis=1).astype(np.uint32)
+
+
+def similarity(sig_a, sig_b):
+    """Estimated Jaccard similarity of two signatures."""
+    return float(np.count_nonzero(sig_a == sig_b)) / SIGNATURE_SIZE
+
+
+def _band_keys(sig):
+    return [
+        f"newsdup_band_{i}_{zlib.crc32(sig[i * ROWS:(i + 1) * ROWS].tobytes()):08x}"
+        for i in range(BANDS)
+    ]
+
+
+def cluster_for(title, item_key):
+    """
+    Cluster id for a headline, registering it if it is new. `item_key`
+    (e.g. the URL) names the cluster when this title starts one.
+    """
+    sig = signature(title)
+    if sig is None:
+        return item_key
+
+    band_keys = _band_keys(sig)
+    bands = cache.get_many(band_keys)
+
+    best, best_similarity = None, SIMILARITY_THRESHOLD
+    candidates = set(bands.values())
+    if candidates:
+        stored = cache.get_many([f"newsdup_sig_{c}" for c in candidates])
+        for candidate in candidates:
+            candidate_sig = stored.get(f"newsdup_sig_{candidate}")
+            if candidate_sig is None:
+                continue
+            score = similarity(sig, np.frombuffer(candidate_sig, dtype=np.uint32))
+            if score >= best_similarity:
+                best, best_similarity = candidate, score
+
+    cluster = best or f"{zlib.crc32(item_key.encode()):08x}"
+    updates = {key: cluster for key in band_keys if key not in bands}
+    if best is None:
+        updates[f"newsdup_sig_{cluster}"] = sig.tobytes()
+    if updates:
+        cache.set_many(updates, CLUSTER_TTL)
+    return cluster
@@ -0,0 +1,133 @@
+"""
+Per-user cache of whole dashboard responses.
+
+A cached body is keyed by endpoint, user, preferences version, data
+version and query string, so it is never invalidated explicitly: a new
+key simply misses.
+
+- The preferences version is a fingerprint of the user's UserPreferences
+  row, read with one indexed query per request. It is always current,
+  even when each worker has its own cache.
+- The data version comes from the endpoint (the market snapshot time, or
+  a fixed time window for data without a version of its own), plus the
+  FX table time.
+
+Hits return the stored JSON bytes without running the view or rendering.
+Responses built from a view's hard-coded fallback (marked with degraded())
+or while the request is shed are never stored, so a failing upstream
+doesn't pin placeholder data for the whole window.
+
+When preferences are saved, the WARM_ENDPOINTS are rebuilt for that user
+on a background thread. The first dashboard load after a preference change
+is then already warm.
+"""
+import functools
+import logging
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.http import HttpRequest, HttpResponse
+from django.urls import resolve, reverse
+from rest_framework.renderers import JSONRenderer
+
+from monitoring import admission
+from monitoring.metrics import cache_get
+from monitoring.timing import timed
+from onboarding.models import UserPreferences
+from .fx import usd_rates
+
+
+logger = logging.getLogger(__name__)
+
+# URL names rebuilt in the background after a preference change: what the dashboard page loads
+WARM_ENDPOINTS = ["news", "prices", "markets", "price-history", "price-history-all"]
+
+PREFS_FIELDS = ("crypto_assets", "investor_type", "content_preferences", "quote_currency")
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="response-cache-warm")
+
+
+def prefs_version(user_id):
+    """Fingerprint of the user's current preferences ("none" without any)."""
+    with timed("prefs"):
+        fields = UserPreferences.objects.filter(user_id=user_id).values_list(*PREFS_FIELDS).first()
+    if fields is None:
+        return "none"
+    return f"{zlib.crc32(repr(fields).encode()):08x}"
+
+
+def window_version(seconds):
+    """Data version for data without one of its own: changes every `seconds`."""
+    return lambda: int(time.time() // seconds)
+
+
+def degraded(response, reason="fallback"):
+    """Mark a response built from fallback data; it is sent but never cached."""
+    response["X-Degraded"] = reason
+    return response
+
+
+def cached_response(endpoint, data_version):
+    """
+    Cache a GET view's successful JSON responses per user. Goes between
+    @permission_classes and the view, so it sees the authenticated user.
+    `data_version` is a callable returning a token that changes with the
+    upstream data.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if not settings.RESPONSE_CACHE_ENABLED:
+                return view(request, *args, **kwargs)
+
+            query = request.META.get("QUERY_STRING", "")
+            key = (
+                f"resp_{endpoint}_{request.user.pk}_{prefs_version(request.user.pk)}_"
+                f"{data_version()}_{usd_rates()['as_of']}_{zlib.crc32(query.encode()):08x}"
+            )
+            body = cache_get("response", key)
+            if body is not None:
+                return HttpResponse(body, content_type="application/json")
+
+            response = view(request, *args, **kwargs)
+            # Fallback and shed answers are placeholders; don't keep those
+            if response.status_code != 200 or response.has_header("X-Degraded") or admission.is_shed():
+                return response
+            body = JSONRenderer().render(response.data)
+            cache.set(key, body, settings.RESPONSE_CACHE_TTL)
+            return HttpResponse(body, content_type="application/json")
+        return wrapper
+    return decorator
+
+
+def warm(user):
+    """Build the WARM_ENDPOINTS responses for `user` by running the views."""
+    for name in WARM_ENDPOINTS:
+        path = reverse(name)
+        request = HttpRequest()
+        request.method = "GET"
+        request.path = request.path_info = path
+        request.META = {"SERVER_NAME": "localhost", "SERVER_PORT": "80", "REMOTE_ADDR": "127.0.0.1"}
+        # Read by DRF's Request in place of the authentication classes
+        request._force_auth_user = user
+        try:
+            resolve(path).func(request)
+        except Exception as e:
+            logger.warning(f"Warming {name} for user {user.pk} failed: {e}")
+
+
+def _warm_in_background(user):
+    try:
+        warm(user)
+    finally:
+        connections.close_all()
+
+
+def preferences_changed(preferences):
+    """Rebuild the user's dashboard responses for their new preferences."""
+    if settings.RESPONSE_CACHE_ENABLED and settings.RESPONSE_CACHE_WARM:
+        _executor.submit(_warm_in_background, preferences.user)
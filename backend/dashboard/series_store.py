@@ -0,0 +1,316 @@
+"""
+Memory-mapped multi-resolution price store, in the style of RRD.
+
+Each (asset, resolution) pair is one fixed-size file holding a ring of
+buckets: a 64-byte header followed by int64 timestamps (ms) and float64
+prices. Bucket `b` (unix seconds // step) always lives in slot
+`b % capacity` and keeps the last price seen in that bucket, so files never
+grow and old buckets are overwritten in place.
+
+A single writer process (see the run_series_writer command) updates the
+files; every gunicorn worker maps them read-only and copies just the
+requested slice out with one NumPy copy. A sequence counter in the header
+lets readers detect and retry reads that overlap a write. Reads return an
+ArraySeries, which only becomes Python lists when it is serialized.
+"""
+import fcntl
+import mmap
+import os
+import struct
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+from django.conf import settings
+
+
+# name -> (bucket size in seconds, number of buckets kept)
+RESOLUTIONS = {
+    "5m": (300, 2016),     # 7 days
+    "1h": (3600, 2160),    # 90 days
+    "1d": (86400, 1825),   # 5 years
+}
+
+# The market_chart period each resolution is fed from. One source each, so
+# polls at different sampling rates don't keep rewriting each other's buckets
+RESOLUTION_SOURCE = {
+    "5m": "1d",
+    "1h": "30d",
+    "1d": "1y",
+}
+
+# Finest resolution that still covers each dashboard period
+PERIOD_RESOLUTION = {
+    "1d": "5m",
+    "7d": "1h",
+    "30d": "1h",
+    "1y": "1d",
+}
+
+MAGIC = b"PXRR"
+VERSION = 1
+# magic, version, step_s, capacity, last_bucket, seq, generation
+HEADER = struct.Struct("<4sIqqqQq")
+HEADER_SIZE = 64
+
+# How often a reader re-checks for files created or replaced by the writer
+REOPEN_INTERVAL = 5.0
+
+
+def _path(asset, resolution):
+    return Path(settings.SERIES_STORE_DIR) / f"{asset}-{resolution}.rrd"
+
+
+def _file_size(capacity):
+    return HEADER_SIZE + 16 * capacity
+
+
+class ArraySeries:
+    """
+    Read-only [[ts_ms, price], ...] sequence over NumPy timestamp and price
+    arrays. series_arrays() uses the arrays as they are; the point lists are
+    only built for iteration and JSON (DRF's encoder calls tolist()).
+    """
+
+    __slots__ = ("timestamps", "prices", "_points")
+
+    def __init__(self, timestamps, prices):
+        self.timestamps = timestamps
+        self.prices = prices
+        self._points = None
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def __bool__(self):
+        return len(self.timestamps) > 0
+
+    def __iter__(self):
+        return iter(self.tolist())
+
+    def __getitem__(self, index):
+        return self.tolist()[index]
+
+    def arrays(self):
+        return self.timestamps, self.prices
+
+    def tolist(self):
+        if self._points is None:
+            self._points = [[t, p] for t, p in zip(self.timestamps.tolist(), self.prices.tolist())]
+        return self._points
+
+
+class SeriesFile:
+    """One mmapped ring file. Readers use it read-only; the writer opens it writable."""
+
+    def __init__(self, path, writable=False):
+        self.path = path
+        with open(path, "r+b" if writable else "rb") as f:
+            self.inode = os.fstat(f.fileno()).st_ino
+            access = mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ
+            self.map = mmap.mmap(f.fileno(), 0, access=access)
+
+        magic, version, self.step, self.capacity, _, _, _ = HEADER.unpack_from(self.map, 0)
+        if magic != MAGIC or version != VERSION or len(self.map) != _file_size(self.capacity):
+            self.map.close()
+            raise ValueError(f"{path} is not a version {VERSION} series file")
+
+        self.timestamps = np.frombuffer(self.map, "<i8", self.capacity, HEADER_SIZE)
+        self.prices = np.frombuffer(self.map, "<f8", self.capacity, HEADER_SIZE + 8 * self.capacity)
+
+    @property
+    def header(self):
+        """(last_bucket, seq, generation) as currently stored."""
+        return HEADER.unpack_from(self.map, 0)[4:]
+
+    def read(self, buckets):
+        """
+        Return an ArraySeries for the newest `buckets` buckets, oldest first,
+        skipping empty ones. Retries if the writer was mid-update.
+
+        The slice is copied out of the map before the sequence counter is
+        checked again: every ingest rewrites the slots it polled, so views
+        into the map could change after the check.
+        """
+        buckets = min(buckets, self.capacity)
+        for _ in range(10):
+            last_bucket, seq, _ = self.header
+            if seq % 2 or last_bucket < 0:
+                time.sleep(0)
+                continue
+
+            first_bucket = last_bucket - buckets + 1
+            start, end = first_bucket % self.capacity, last_bucket % self.capacity + 1
+            if start < end:
+                timestamps, prices = self.timestamps[start:end].copy(), self.prices[start:end].copy()
+            else:
+                timestamps = np.concatenate((self.timestamps[start:], self.timestamps[:end]))
+                prices = np.concatenate((self.prices[start:], self.prices[:end]))
+
+            if self.header[1] == seq:
+                filled = timestamps >= first_bucket * self.step * 1000
+                if not filled.all():
+                    timestamps, prices = timestamps[filled], prices[filled]
+                return ArraySeries(timestamps, prices)
+        return None
+
+    def close(self):
+        """Unmap the file. Only for the writer; readers drop replaced files instead (see SeriesReader)."""
+        self.timestamps = self.prices = None
+        self.map.close()
+
+
+class SeriesReader:
+    """
+    Per-process cache of read-only maps, reopened when the writer creates or
+    replaces a file. Shared by a worker's threads: a replaced file is never
+    closed, since another thread may be reading it; it is unmapped once the
+    last reference goes away.
+    """
+
+    def __init__(self):
+        self._files = {}
+        self._lock = threading.Lock()
+
+    def get(self, asset, resolution):
+        path = _path(asset, resolution)
+        with self._lock:
+            entry = self._files.get(path)
+            now = time.monotonic()
+            if entry is not None and now - entry[1] < REOPEN_INTERVAL:
+                return entry[0]
+
+            current = entry[0] if entry else None
+            try:
+                inode = os.stat(path).st_ino
+            except FileNotFoundError:
+                inode = None
+
+            if current is not None and current.inode != inode:
+                current = None
+            if current is None and inode is not None:
+                try:
+                    current = SeriesFile(path)
+                except (OSError, ValueError):
+                    current = None
+
+            self._files[path] = (current, now)
+            return current
+
+    def read(self, asset, period, days):
+        """Slice `days` worth of the period's resolution for `asset`, or None if the store has no data."""
+        resolution = PERIOD_RESOLUTION.get(period)
+        series = self.get(asset, resolution) if resolution else None
+        if series is None:
+            return None
+
+        # Don't serve a frozen series if the writer has stopped
+        last_bucket = series.header[0]
+        if (last_bucket + 1) * series.step < time.time() - settings.SERIES_STORE_MAX_STALENESS:
+            return None
+
+        points = series.read(days * 86400 // series.step)
+        return points or None
+
+
+class SeriesWriter:
+    """
+    The single process allowed to update the store. Holds an exclusive
+    lock on the directory for its lifetime.
+    """
+
+    def __init__(self):
+        self.directory = Path(settings.SERIES_STORE_DIR)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        self._lock = open(self.directory / "writer.lock", "w")
+        try:
+            fcntl.flock(self._lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            self._lock.close()
+            raise RuntimeError(f"another writer already holds {self.directory}")
+        self._files = {}
+
+    def _open(self, asset, resolution):
+        key = (asset, resolution)
+        if key not in self._files:
+            step, capacity = RESOLUTIONS[resolution]
+            path = _path(asset, resolution)
+            try:
+                series = SeriesFile(path, writable=True)
+                if (series.step, series.capacity) != (step, capacity):
+                    series.close()
+                    raise ValueError("resolution changed")
+            except (OSError, ValueError):
+                series = self._create(path, step, capacity)
+            self._files[key] = series
+        return self._files[key]
+
+    def _create(self, path, step, capacity):
+        # Build the file aside and swap it in, so readers never map a partial file
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, step, capacity, -1, 0, time.time_ns()).ljust(HEADER_SIZE, b"\0"))
+            f.truncate(_file_size(capacity))
+        os.replace(tmp, path)
+        return SeriesFile(path, writable=True)
+
+    def ingest(self, asset, period, points):
+        """
+        Write a market_chart `period`'s [[ts_ms, price], ...] into the
+        resolutions fed from that period (see RESOLUTION_SOURCE). Returns
+        the number of resolutions updated.
+        """
+        updated = 0
+        for resolution, source in RESOLUTION_SOURCE.items():
+            if source == period and points:
+                self._write(self._open(asset, resolution), points)
+                updated += 1
+        return updated
+
+    def fill(self, asset, resolution, points):
+        """
+        Write [[ts_ms, price], ...] into the buckets of one resolution that
+        hold no data yet, so polled prices always win. Returns buckets filled.
+        """
+        series = self._open(asset, resolution)
+        step, capacity = series.step, series.capacity
+        last_bucket = series.header[0]
+        missing = []
+        for ts, price in points:
+            bucket = int(ts) // 1000 // step
+            if bucket > last_bucket or series.timestamps[bucket % capacity] != bucket * step * 1000:
+                missing.append((ts, price))
+        if missing:
+            self._write(series, missing)
+        return len(missing)
+
+    def _write(self, series, points):
+        step, capacity = series.step, series.capacity
+        last_bucket, seq, generation = series.header
+
+        HEADER.pack_into(series.map, 0, MAGIC, VERSION, step, capacity, last_bucket, seq + 1, generation)
+        for ts, price in points:
+            bucket = int(ts) // 1000 // step
+            if bucket <= last_bucket - capacity:
+                continue  # Older than the ring keeps
+            if bucket > last_bucket:
+                # Clear skipped buckets so stale prices from a previous lap don't resurface
+                for gap in range(max(last_bucket + 1, bucket - capacity + 1), bucket):
+                    series.timestamps[gap % capacity] = 0
+                last_bucket = bucket
+            slot = bucket % capacity
+            series.timestamps[slot] = bucket * step * 1000
+            series.prices[slot] = float(price)
+        HEADER.pack_into(series.map, 0, MAGIC, VERSION, step, capacity, last_bucket, seq + 2, generation)
+
+    def close(self):
+        for series in self._files.values():
+            series.map.flush()
+            series.close()
+        self._files.clear()
+        self._lock.close()
+
+
+reader = SeriesReader()
@@ -0,0 +1,12 @@
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from onboarding.models import UserPreferences
+from .response_cache import preferences_changed
+
+
+@receiver(post_save, sender=UserPreferences)
+def rebuild_responses(sender, instance, **kwargs):
+    """Warm the user's cached dashboard responses once the new preferences are committed."""
+    transaction.on_commit(lambda: preferences_changed(instance))
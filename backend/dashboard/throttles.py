@@ -0,0 +1,80 @@
+"""
+Per-endpoint throttling for the dashboard's upstream-heavy views.
+
+Each throttled endpoint gets two sliding-window limits kept in the shared
+cache: one per user and one across all users. The rates are
+DEFAULT_THROTTLE_RATES["<endpoint>"] and ["<endpoint>_global"]. A
+throttled client is not sent a bare 429 when the view has a previous
+result for it. exception_handler replays that result instead, with
+X-Throttled and Retry-After headers, so clients that retry in a loop cost
+no upstream calls.
+"""
+from django.core.cache import cache
+from rest_framework.exceptions import Throttled
+from rest_framework.throttling import SimpleRateThrottle, UserRateThrottle
+from rest_framework.views import exception_handler as drf_exception_handler
+
+
+LAST_RESULT_TTL = 86400
+
+
+class EndpointUserThrottle(UserRateThrottle):
+    """Per-user window (per-IP for anonymous clients)."""
+    endpoint = None
+
+    def allow_request(self, request, view):
+        allowed = super().allow_request(request, view)
+        if not allowed:
+            request.throttled_endpoint = self.endpoint
+        return allowed
+
+
+class EndpointGlobalThrottle(SimpleRateThrottle):
+    """One window shared by every client of the endpoint."""
+    endpoint = None
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {'scope': self.scope, 'ident': 'all'}
+
+    def allow_request(self, request, view):
+        # DRF runs every throttle even after one denies; a request already
+        # refused per-user must not use up the shared window
+        if getattr(request, 'throttled_endpoint', None):
+            return True
+        allowed = super().allow_request(request, view)
+        if not allowed:
+            request.throttled_endpoint = self.endpoint
+        return allowed
+
+
+def endpoint_throttles(endpoint):
+    """Throttle classes for @throttle_classes: the per-user limit, then the global one."""
+    return [
+        type(f'{endpoint}_user_throttle', (EndpointUserThrottle,), {'scope': endpoint, 'endpoint': endpoint}),
+        type(f'{endpoint}_global_throttle', (EndpointGlobalThrottle,), {'scope': f'{endpoint}_global', 'endpoint': endpoint}),
+    ]
+
+
+def _last_result_key(endpoint, request):
+    user = request.user
+    ident = user.pk if user and user.is_authenticated else request.META.get('REMOTE_ADDR')
+    return f'throttle_last_{endpoint}_{ident}'
+
+
+def remember_result(request, endpoint, data):
+    """Keep a successful response body to replay if this client gets throttled."""
+    cache.set(_last_result_key(endpoint, request), data, LAST_RESULT_TTL)
+
+
+def exception_handler(exc, context):
+    """DRF's handler, except throttled requests replay the previous result when there is one."""
+    response = drf_exception_handler(exc, context)
+    request = context.get('request')
+    endpoint = getattr(request, 'throttled_endpoint', None)
+    if isinstance(exc, Throttled) and endpoint and response is not None:
+        previous = cache.get(_last_result_key(endpoint, request))
+        if previous is not None:
+            response.data = previous
+            response.status_code = 200
+            response['X-Throttled'] = endpoint
+    return response
@@ -0,0 +1,211 @@
+"""
+Resized meme thumbnails served from a bounded on-disk cache.
+
+A meme image is fetched from its host once, then scaled to fit within
+MEME_THUMB_MAX_SIDE pixels and re-encoded as WebP. The result is stored
+as `<sha256 of the thumbnail>.webp` in MEME_CACHE_DIR. The file name is
+the content hash, so a URL always means the same bytes and browsers may
+cache it forever. The source URL -> hash mapping lives in the shared
+cache, so every worker finds a thumbnail another worker already built.
+The meme endpoint never waits for a build: ready_thumbnail() starts one
+on a background thread and the original URL is used until it is done.
+
+Source images are only fetched from MEME_IMAGE_ORIGINS, matched on exact
+scheme, host and port (the defaults are all https), and redirects are not
+followed: a meme URL can't point the server at an internal address.
+
+The directory is kept under MEME_CACHE_MAX_BYTES as an LRU: serving a
+thumbnail touches its mtime, and eviction removes the least recently
+touched files first.
+"""
+import hashlib
+import io
+import logging
+import os
+import re
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.cache import cache
+from PIL import Image, UnidentifiedImageError
+
+from monitoring.metrics import cache_get, upstream_request
+
+
+logger = logging.getLogger(__name__)
+
+DIGEST_PATTERN = re.compile(r"[0-9a-f]{64}")
+SUFFIX = ".webp"
+# Refuse decompression bombs long before they reach memory
+Image.MAX_IMAGE_PIXELS = 40_000_000
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="meme-thumbnail")
+_building = set()
+_building_lock = threading.Lock()
+
+
+def cache_dir():
+    return Path(settings.MEME_CACHE_DIR)
+
+
+def thumbnail_path(digest):
+    """
+    Path of a stored thumbnail, rebuilding it if this process's disk lost it
+    (evicted, or built by another instance). None if it can't be found.
+    """
+    if not DIGEST_PATTERN.fullmatch(digest):
+        return None
+    path = cache_dir() / f"{digest}{SUFFIX}"
+    try:
+        # Mark as recently used for eviction
+        os.utime(path)
+        return path
+    except FileNotFoundError:
+        pass
+
+    source_url = cache.get(f"meme_thumb_src_{digest}")
+    if source_url is None or thumbnail_for(source_url) != digest:
+        return None
+    return path
+
+
+def _mapping_key(source_url):
+    return f"meme_thumb_{hashlib.sha1(source_url.encode()).hexdigest()}"
+
+
+def ready_thumbnail(source_url):
+    """
+    Content hash of the thumbnail for `source_url` if it is already built.
+    Otherwise starts building it in the background and returns None, so
+    callers use the original URL this time.
+    """
+    digest = cache_get("meme_thumb", _mapping_key(source_url))
+    if digest is not None and (cache_dir() / f"{digest}{SUFFIX}").exists():
+        return digest
+    if _allowed(source_url):
+        with _building_lock:
+            if source_url in _building:
+                return None
+            _building.add(source_url)
+        _executor.submit(_build_in_background, source_url)
+    return None
+
+
+def _build_in_background(source_url):
+    try:
+        thumbnail_for(source_url)
+    except Exception as e:
+        logger.warning(f"Thumbnailing meme {source_url} failed: {e}")
+    finally:
+        with _building_lock:
+            _building.discard(source_url)
+
+
+def thumbnail_for(source_url):
+    """
+    Content hash of the thumbnail for `source_url`, building and storing it
+    on first use. Returns None if the image could not be fetched or decoded,
+    in which case callers should fall back to the original URL.
+    """
+    key = _mapping_key(source_url)
+    digest = cache_get("meme_thumb", key)
+    if digest is not None and (cache_dir() / f"{digest}{SUFFIX}").exists():
+        return digest
+
+    data = _download(source_url)
+    if data is None:
+        return None
+    try:
+        thumbnail = _resize(data)
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError) as e:
+        logger.warning(f"Could not thumbnail meme {source_url}: {e}")
+        return None
+
+    digest = hashlib.sha256(thumbnail).hexdigest()
+    _store(digest, thumbnail)
+    cache.set_many({key: digest, f"meme_thumb_src_{digest}": source_url}, settings.MEME_CACHE_MAPPING_TTL)
+    return digest
+
+
+def _allowed(url):
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return False
+    # netloc keeps any userinfo and port, so "https://i.redd.it@10.0.0.1" doesn't match
+    return f"{parts.scheme}://{parts.netloc}".lower() in settings.MEME_IMAGE_ORIGINS
+
+
+def _download(url):
+    if not _allowed(url):
+        logger.warning(f"Meme image {url} is not on an allowed host")
+        return None
+    try:
+        # A redirect could lead anywhere; the non-200 status below refuses it
+        response = upstream_request("meme-image", "GET", url, timeout=5, stream=True, allow_redirects=False)
+    except Exception as e:
+        logger.warning(f"Could not fetch meme image {url}: {e}")
+        return None
+    with response:
+        if response.status_code != 200:
+            return None
+        chunks, size = [], 0
+        for chunk in response.iter_content(64 * 1024):
+            size += len(chunk)
+            if size > settings.MEME_SOURCE_MAX_BYTES:
+                logger.warning(f"Meme image {url} is over {settings.MEME_SOURCE_MAX_BYTES} bytes")
+                return None
+            chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def _resize(data):
+    with Image.open(io.BytesIO(data)) as image:
+        # Animated GIFs keep their first frame
+        image.seek(0)
+        image = image.convert("RGBA" if image.mode in ("RGBA", "LA", "P") else "RGB")
+        side = settings.MEME_THUMB_MAX_SIDE
+        image.thumbnail((side, side), Image.Resampling.LANCZOS)
+        out = io.BytesIO()
+        image.save(out, "WEBP", quality=settings.MEME_THUMB_QUALITY, method=4)
+    return out.getvalue()
+
+
+def _store(digest, data):
+    directory = cache_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{digest}{SUFFIX}"
+    if not path.exists():
+        # Write then rename, so readers never see a partial file
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    _evict(directory)
+
+
+def _evict(directory):
+    entries = []
+    total = 0
+    for entry in os.scandir(directory):
+        if entry.name.endswith(SUFFIX):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total += stat.st_size
+    if total <= settings.MEME_CACHE_MAX_BYTES:
+        return
+    for _, size, path in sorted(entries):
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            continue
+        total -= size
+        if total <= settings.MEME_CACHE_MAX_BYTES:
+            break
@@ -1,12 +1,19 @@
 from django.urls import path
-from .views import news, prices, ai_insight, meme, price_history, price_history_all
+from .views import news, news_search, prices, markets, ai_insight, meme, meme_image, price_history, price_history_all, indicators, candles, price_stream, stream_ticket
 
 urlpatterns = [
     path('dashboard/news/', news, name='news'),
+    path('dashboard/news/search/', news_search, name='news-search'),
     path('dashboard/prices/', prices, name='prices'),
+    path('dashboard/markets/', markets, name='markets'),
     path('dashboard/price-history/', price_history, name='price-history'),
     path('dashboard/price-history-all/', price_history_all, name='price-history-all'),
+    path('dashboard/indicators/', indicators, name='indicators'),
+    path('dashboard/candles/', candles, name='candles'),
+    path('dashboard/stream/', price_stream, name='price-stream'),
+    path('dashboard/stream/ticket/', stream_ticket, name='stream-ticket'),
     path('dashboard/ai-insight/', ai_insight, name='ai-insight'),
     path('dashboard/meme/', meme, name='meme'),
+    path('dashboard/meme/img/<str:digest>.webp', meme_image, name='meme-image'),
 ]
 
@@ -1,25 +1,62 @@
-import requests
+import asyncio
+import hashlib
+import json
 import random
+import secrets
 import time
-from rest_framework.decorators import api_view, permission_classes
+from datetime import timedelta
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import Max
+from django.http import FileResponse, Http404, HttpResponseNotModified, JsonResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.views.decorators.http import require_GET
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
 from onboarding.models import UserPreferences
+from alerts.engine import check_prices
 from django.conf import settings
-from django.core.cache import cache
+from django.utils import timezone
+from monitoring.metrics import upstream_request
+from monitoring.timing import timed
+from users.authentication import TimedJWTAuthentication
+from users.models import User
+from .assets import COINGECKO_IDS, PERIOD_DAY_MAP
+from .history import load_history
+from .candles import INTERVALS, candles_for
+from .fx import convert_prices, rate_for
+from .delta import news_delta, series_delta, wants_delta
+from .live import PriceFeed
+from .markets import convert_snapshot, market_snapshot, snapshot_prices, snapshot_version
+from .response_cache import cached_response, degraded, window_version
+from .news_archive import archive_news, article_url, search as search_news
+from .indicators import indicators_for, series_arrays
+from .thumbnails import ready_thumbnail, thumbnail_path
+from .models import NewsItem, StreamTicket
+from .throttles import endpoint_throttles, remember_result
 import logging
 
 
+# How long the data behind endpoints without their own data version is reused
+NEWS_WINDOW_SECONDS = 120
+HISTORY_WINDOW_SECONDS = 300
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@cached_response('news', window_version(NEWS_WINDOW_SECONDS))
 def news(request):
     """
     Filter CryptoPanic news based on user's selected crypto assets.
-    Only include articles that reference at least one selected asset.
+    Only include articles that reference at least one selected asset, and
+    only one article per story when several outlets carry it.
     """
     # Get user preferences
     try:
-        preferences = UserPreferences.objects.get(user=request.user)
+        with timed('prefs'):
+            preferences = UserPreferences.objects.get(user=request.user)
         crypto_assets = preferences.crypto_assets if preferences.crypto_assets else ['BTC', 'ETH']
     except UserPreferences.DoesNotExist:
         crypto_assets = ['BTC', 'ETH']
@@ -28,8 +65,10 @@ def news(request):
     currencies_str = ','.join(crypto_assets)
     
     try:
-        response = requests.get(
-            'https://cryptopanic.com/api/v1/posts/',
+        response = upstream_request(
+            'cryptopanic',
+            'GET',
+            f'{settings.CRYPTOPANIC_API_URL}/posts/',
             params={
                 'public': 'true',
                 'filter': 'hot',
@@ -42,14 +81,19 @@ def news(request):
             data = response.json()
             results = data.get('results', [])
 
+            # Archive everything fetched; also assigns near-duplicate clusters
+            with timed('archive'):
+                clusters = archive_news(results)
+
             cleaned = []
+            seen_clusters = set()
             asset_keywords = {
                 'BTC': ['bitcoin', 'btc'],
                 'ETH': ['ethereum', 'eth'],
                 'SOL': ['solana', 'sol']
             }
             
-            for item in results:
+            for item, cluster in zip(results, clusters):
                 title = item.get("title", "").strip().lower()
                 if not title or len(title) < 20:
                     continue
@@ -71,13 +115,12 @@ def news(request):
 
                 source_obj = item.get("source") or {}
                 source_name = source_obj.get("title", "CryptoPanic")
+                url = article_url(item)
 
-                # Prefer item["url"], then source["url"], last resort is CryptoPanic search
-                url = item.get("url")
-                if not url:
-                    url = source_obj.get("url")
-                if not url:
-                    url = f"https://cryptopanic.com/search?q={'+'.join(item.get('title', '').split()[:4])}"
+                # Near-duplicate headlines share a cluster; keep the first of each
+                if cluster in seen_clusters:
+                    continue
+                seen_clusters.add(cluster)
 
                 cleaned.append({
                     "title": item.get("title", "").strip(),
@@ -90,7 +133,7 @@ def news(request):
                     break
 
             if cleaned:
-                return Response(cleaned)
+                return _news_response(request, cleaned, crypto_assets)
 
     except Exception:
         pass
@@ -131,23 +174,83 @@ def news(request):
             "published_at": ""
         })
 
-    return Response(fallback)
+    return degraded(_news_response(request, fallback, crypto_assets, fallback=True))
+
+
+def _news_response(request, items, crypto_assets, fallback=False):
+    """The news list, or with ?since= only the items added since the client's cursor."""
+    if not wants_delta(request):
+        return Response(items)
+    with timed('db'):
+        ids = dict(NewsItem.objects.filter(url__in=[item["url"] for item in items]).values_list("url", "id"))
+        latest_id = NewsItem.objects.aggregate(latest=Max("id"))["latest"]
+    return Response(news_delta(
+        items, [ids.get(item["url"]) for item in items], request.GET["since"], latest_id, crypto_assets, fallback=fallback,
+    ))
 
 
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+def news_search(request):
+    """
+    Full-text search over archived headlines, newest first.
+    Query: q=<words>, asset=BTC,ETH (any of), limit (max 100), cursor from
+    the previous page's next_cursor.
+    """
+    try:
+        limit = min(max(int(request.GET.get("limit", 20)), 1), 100)
+        cursor = int(request.GET["cursor"]) if request.GET.get("cursor") else None
+    except ValueError:
+        return Response({"error": "limit and cursor must be integers"}, status=400)
+    assets = [a for a in request.GET.get("asset", "").upper().split(",") if a]
+
+    with timed('db'):
+        items, next_cursor = search_news(request.GET.get("q", "").strip(), assets, cursor, limit)
+
+    return Response({
+        "results": [
+            {
+                "title": item.title,
+                "source": item.source,
+                "url": item.url,
+                "published_at": item.published_at.isoformat() if item.published_at else "",
+            }
+            for item in items
+        ],
+        "next_cursor": str(next_cursor) if next_cursor else None,
+    })
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@cached_response('prices', lambda: snapshot_version(COINGECKO_IDS))
 def prices(request):
-    """Fetch prices from CoinGecko based on user's crypto asset preferences"""
+    """
+    USD prices for the user's crypto asset preferences, converted locally to
+    the user's quote currency. Read from the shared market snapshot, with a
+    direct simple/price call only if there has never been one.
+    """
+    quote_currency = 'USD'
     try:
         # Get user preferences to determine which coins to fetch
         try:
-            preferences = UserPreferences.objects.get(user=request.user)
+            with timed('prefs'):
+                preferences = UserPreferences.objects.get(user=request.user)
             crypto_assets = preferences.crypto_assets
+            quote_currency = preferences.quote_currency
         except UserPreferences.DoesNotExist:
             # Default to BTC if no preferences
             crypto_assets = ['BTC']
+            quote_currency = 'USD'
         
+        snapshot = market_snapshot(COINGECKO_IDS)
+        if snapshot is not None:
+            prices_dict = snapshot_prices(snapshot, crypto_assets or ['BTC', 'ETH'])
+            if prices_dict:
+                check_prices(prices_dict)
+                return Response(convert_prices(prices_dict, quote_currency))
+
         # Map user's asset codes to CoinGecko IDs
         coin_mapping = {
             'BTC': 'bitcoin',
@@ -163,8 +266,10 @@ def prices(request):
         coin_ids_str = ','.join(coin_ids)
         
         # Fetch prices from CoinGecko
-        response = requests.get(
-            'https://api.coingecko.com/api/v3/simple/price',
+        response = upstream_request(
+            'coingecko',
+            'GET',
+            f'{settings.COINGECKO_API_URL}/simple/price',
             params={
                 'ids': coin_ids_str,
                 'vs_currencies': 'usd'
@@ -182,118 +287,85 @@ def prices(request):
             
             # If no prices found, return empty dict
             if prices_dict:
-                return Response(prices_dict)
+                check_prices(prices_dict)
+                return Response(convert_prices(prices_dict, quote_currency))
     except Exception as e:
         pass  # Fall through to fallback
     
     # Fallback prices
-    return Response({
+    return degraded(Response(convert_prices({
         'BTC': 45000,
         'ETH': 2500,
         'SOL': 100
-    })
+    }, quote_currency)))
 
 
 logger = logging.getLogger(__name__)
 
-COINGECKO_IDS = {
-    "BTC": "bitcoin",
-    "ETH": "ethereum",
-    "SOL": "solana",
-}
-
-PERIOD_DAY_MAP = {
-    "1d": 1,
-    "7d": 7,
-    "30d": 30,
-    "1y": 365,
-}
-
-
-def fetch_history_coingecko(asset, period):
-    """Fetch OHLC-style historical prices from CoinGecko with full caching + fallback."""
-    coin_id = COINGECKO_IDS.get(asset)
-    if not coin_id:
-        return None
-
-    days = PERIOD_DAY_MAP.get(period, 7)
-
-    cache_key = f"cg_hist_{asset}_{period}"
-    cached = cache.get(cache_key)
-    if cached:
-        return cached  # USE CACHED
-
-    url = f"https://api.coingecko.com/api/v3/coins/{coin_id}/market_chart"
-    params = {"vs_currency": "usd", "days": days}
-
-    try:
-        resp = requests.get(url, params=params, timeout=10)
-
-        if resp.status_code == 429:
-            logger.warning(f"RATE LIMITED for {asset} {period}")
-            return None
-
-        if resp.status_code != 200:
-            logger.warning(f"CG returned {resp.status_code} for {asset} {period}")
-            return None
-
-        data = resp.json()
-        prices = data.get("prices", [])
-
-        formatted = [[p[0], float(p[1])] for p in prices]
-
-        if formatted:
-            cache.set(cache_key, formatted, 3600)  # cache 1h
-
-        return formatted
-
-    except Exception as e:
-        logger.error(f"Error fetching {asset} {period}: {e}")
-        return None
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+@cached_response("markets", lambda: snapshot_version(COINGECKO_IDS))
+def markets(request):
+    """
+    Price, 24h change, 24h volume and 7d hourly sparkline for the user's
+    assets (all supported assets if none are chosen), in their quote currency.
+    Everything comes from one cached coins/markets call.
+    """
+    with timed("prefs"):
+        prefs = UserPreferences.objects.filter(user=request.user).first()
+    assets = [a for a in (prefs.crypto_assets if prefs else []) if a in COINGECKO_IDS] or list(COINGECKO_IDS)
+    currency = prefs.quote_currency if prefs else "USD"
 
+    snapshot = market_snapshot(COINGECKO_IDS)
+    if snapshot is None:
+        return Response({"error": "Market data unavailable"}, status=503)
 
+    return Response({
+        "currency": currency,
+        "as_of": snapshot["as_of"],
+        "assets": convert_snapshot(snapshot, assets, currency),
+    })
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@cached_response('price-history', window_version(HISTORY_WINDOW_SECONDS))
 def price_history(request):
     """
     Fetch historical price data for a single period (e.g., 7d, 1y)
     with caching, rate-limit protection, and fallbacks.
     """
     try:
-        prefs = UserPreferences.objects.filter(user=request.user).first()
+        with timed('prefs'):
+            prefs = UserPreferences.objects.filter(user=request.user).first()
         crypto_assets = prefs.crypto_assets if prefs else ["BTC", "ETH"]
+        quote_currency = prefs.quote_currency if prefs else "USD"
 
         # Default period
         period = request.GET.get("period", "7d")
 
-        # Cache key for this specific user + period + their coins
-        cache_key = f"cg_single_hist_{'_'.join(sorted(crypto_assets))}_{period}"
-
-        cached = cache.get(cache_key)
-        if cached:
-            return Response(cached)
-
         result = {}
 
-        # Attempt fetching each asset using CoinGecko
+        # Each asset comes from the series store or the per-asset CoinGecko cache
         for asset in crypto_assets:
-            hist = fetch_history_coingecko(asset, period)
+            hist = load_history(asset, period, quote_currency)
             if hist:
                 result[asset] = hist
 
-        # If at least one succeeded, return partial success
-        if result:
-            cache.set(cache_key, result, 3600)  # 1 hour cache
-            return Response(result)
-
         # If all failed (rate-limited or no network), give fallback
-        fallback = {
-            "BTC": [[0, 45000]],
-            "ETH": [[0, 2500]],
-        }
+        if not result:
+            result = {
+                "BTC": [[0, 45000]],
+                "ETH": [[0, 2500]],
+            }
+            if wants_delta(request):
+                return degraded(Response(series_delta(
+                    {period: result}, quote_currency, request.GET["since"], crypto_assets, fallback=True,
+                )))
+            return degraded(Response(result))
 
-        return Response(fallback, status=200)
+        if wants_delta(request):
+            return Response(series_delta({period: result}, quote_currency, request.GET["since"], crypto_assets))
+        return Response(result)
 
     except Exception as e:
         logger.error(f"price_history fatal error: {e}")
@@ -301,10 +373,13 @@ def price_history(request):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@cached_response('price-history-all', window_version(HISTORY_WINDOW_SECONDS))
 def price_history_all(request):
     try:
-        prefs = UserPreferences.objects.filter(user=request.user).first()
+        with timed('prefs'):
+            prefs = UserPreferences.objects.filter(user=request.user).first()
         crypto_assets = prefs.crypto_assets if prefs else ["BTC", "ETH"]
+        quote_currency = prefs.quote_currency if prefs else "USD"
 
         periods = ["7d", "1y"]
 
@@ -313,7 +388,7 @@ def price_history_all(request):
         for period in periods:
             period_data = {}
             for asset in crypto_assets:
-                hist = fetch_history_coingecko(asset, period)
+                hist = load_history(asset, period, quote_currency)
                 if hist:
                     period_data[asset] = hist
 
@@ -321,18 +396,23 @@ def price_history_all(request):
             if period_data:
                 result[period] = period_data
 
-        # If some results exist → return what we have
-        if result:
-            return Response(result)
-
         # If absolutely nothing succeeded → fallback
-        fallback = {
-            "7d": {
-                "BTC": [[0, 45000]],
-                "ETH": [[0, 2500]],
+        if not result:
+            result = {
+                "7d": {
+                    "BTC": [[0, 45000]],
+                    "ETH": [[0, 2500]],
+                }
             }
-        }
-        return Response(fallback, status=200)
+            if wants_delta(request):
+                return degraded(Response(series_delta(
+                    result, quote_currency, request.GET["since"], crypto_assets, fallback=True,
+                )))
+            return degraded(Response(result))
+
+        if wants_delta(request):
+            return Response(series_delta(result, quote_currency, request.GET["since"], crypto_assets))
+        return Response(result)
 
     except Exception as e:
         logger.error(f"price_history_all fatal error: {e}")
@@ -341,6 +421,204 @@ def price_history_all(request):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@cached_response('indicators', window_version(HISTORY_WINDOW_SECONDS))
+def indicators(request):
+    """
+    Market statistics (returns, volatility, SMA/EMA, RSI, support/resistance)
+    for each of the user's assets, computed from the cached price history.
+    """
+    with timed('prefs'):
+        prefs = UserPreferences.objects.filter(user=request.user).first()
+    crypto_assets = prefs.crypto_assets if prefs else ["BTC", "ETH"]
+    quote_currency = prefs.quote_currency if prefs else "USD"
+
+    periods = [p for p in request.GET.get("period", "7d,1y").split(",") if p in PERIOD_DAY_MAP]
+    if not periods:
+        return Response({"error": f"period must be one of {', '.join(PERIOD_DAY_MAP)}"}, status=400)
+
+    result = {}
+    for asset in crypto_assets:
+        asset_data = {}
+        for period in periods:
+            hist = load_history(asset, period, quote_currency)
+            summary = indicators_for(asset, period, hist) if hist else None
+            if summary:
+                asset_data[period] = summary
+        if asset_data:
+            result[asset] = asset_data
+
+    return Response(result)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@cached_response('candles', window_version(HISTORY_WINDOW_SECONDS))
+def candles(request):
+    """
+    OHLC candles per asset for any interval and time range, resampled from
+    the cached tick history.
+    Query: interval=15m|1h|4h|1d, and either period=1d|7d|30d|1y or
+    start/end as epoch milliseconds. asset=BTC,ETH narrows the user's assets.
+    """
+    interval = request.GET.get("interval", "1h")
+    if interval not in INTERVALS:
+        return Response({"error": f"interval must be one of {', '.join(INTERVALS)}"}, status=400)
+
+    now_ms = int(time.time() * 1000)
+    try:
+        if "start" in request.GET:
+            start = int(request.GET["start"])
+            end = int(request.GET.get("end", now_ms))
+        else:
+            period = request.GET.get("period", "7d")
+            start = now_ms - PERIOD_DAY_MAP[period] * 86_400_000
+            end = now_ms
+    except (KeyError, ValueError):
+        return Response({"error": "Invalid period or start/end"}, status=400)
+
+    # Finest source series whose window still reaches back to `start`
+    source_period = next(
+        (p for p, days in sorted(PERIOD_DAY_MAP.items(), key=lambda item: item[1])
+         if now_ms - days * 86_400_000 <= start),
+        "1y",
+    )
+
+    with timed('prefs'):
+        prefs = UserPreferences.objects.filter(user=request.user).first()
+    crypto_assets = prefs.crypto_assets if prefs else ["BTC", "ETH"]
+    quote_currency = prefs.quote_currency if prefs else "USD"
+    if "asset" in request.GET:
+        wanted = request.GET["asset"].split(",")
+        crypto_assets = [a for a in crypto_assets if a in wanted]
+
+    result = {}
+    for asset in crypto_assets:
+        hist = load_history(asset, source_period, quote_currency)
+        if not hist:
+            continue
+        timestamps, prices = series_arrays(hist)
+        ohlc = candles_for(asset, source_period, INTERVALS[interval], timestamps, prices, quote_currency)
+        in_range = ohlc[:, (ohlc[0] + INTERVALS[interval] > start) & (ohlc[0] <= end)]
+        result[asset] = [[int(c[0]), c[1], c[2], c[3], c[4]] for c in in_range.T.tolist()]
+
+    return Response(result)
+
+
+def fetch_live_prices():
+    """USD prices for every supported asset, polled by the live feed."""
+    response = upstream_request(
+        "coingecko",
+        "GET",
+        f"{settings.COINGECKO_API_URL}/simple/price",
+        params={"ids": ",".join(COINGECKO_IDS.values()), "vs_currencies": "usd"},
+        timeout=5,
+    )
+    if response.status_code != 200:
+        logger.warning(f"CG simple/price returned {response.status_code} for live feed")
+        return None
+    data = response.json()
+    prices = {
+        asset: float(data[coin_id]["usd"])
+        for asset, coin_id in COINGECKO_IDS.items()
+        if "usd" in data.get(coin_id, {})
+    }
+    check_prices(prices)
+    return prices
+
+
+price_feed = PriceFeed(fetch_live_prices, settings.LIVE_POLL_INTERVAL, settings.LIVE_QUEUE_SIZE)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def stream_ticket(request):
+    """
+    Single-use ticket for opening the price stream. EventSource can't send
+    headers, and an access token in the URL would end up in proxy logs and
+    browser history; a ticket there is useless once the stream is open.
+    """
+    ticket = secrets.token_urlsafe(32)
+    now = timezone.now()
+    with timed('db'):
+        StreamTicket.objects.filter(expires_at__lte=now).delete()
+        StreamTicket.objects.create(
+            key=_ticket_key(ticket),
+            user=request.user,
+            expires_at=now + timedelta(seconds=settings.LIVE_TICKET_TTL),
+        )
+    return Response({"ticket": ticket, "expires_in": settings.LIVE_TICKET_TTL})
+
+
+def _ticket_key(ticket):
+    return hashlib.sha256(ticket.encode()).hexdigest()
+
+
+def _stream_user(request):
+    """Authenticate a stream request by ?ticket= (see stream_ticket) or the Authorization header."""
+    ticket = request.GET.get("ticket")
+    if ticket:
+        tickets = StreamTicket.objects.filter(key=_ticket_key(ticket), expires_at__gt=timezone.now())
+        user_id = tickets.values_list("user_id", flat=True).first()
+        # delete() reports whether this request removed it, so a ticket opens one stream only
+        if user_id is None or not tickets.delete()[0]:
+            return None
+        return User.objects.filter(pk=user_id).first()
+
+    auth = TimedJWTAuthentication()
+    try:
+        result = auth.authenticate(request)
+        return result[0] if result else None
+    except (InvalidToken, AuthenticationFailed):
+        return None
+
+
+async def _price_events(assets, rate):
+    subscriber = price_feed.subscribe(assets)
+    try:
+        yield "retry: 5000\n\n"
+        while True:
+            try:
+                updated_at, changed = await asyncio.wait_for(
+                    subscriber.queue.get(), settings.LIVE_HEARTBEAT_SECONDS
+                )
+            except asyncio.TimeoutError:
+                # Keeps proxies from closing idle connections
+                yield ": keepalive\n\n"
+                continue
+            data = json.dumps({asset: price * rate for asset, price in changed.items()})
+            yield f"id: {updated_at}\nevent: prices\ndata: {data}\n\n"
+    finally:
+        # Also runs when the client disconnects and the generator is cancelled
+        price_feed.unsubscribe(subscriber)
+
+
+async def price_stream(request):
+    """
+    Server-Sent Events stream of price changes for the user's assets, in
+    their quote currency. All connections in a worker share one upstream
+    poller. Only served by the ASGI app (see README).
+    """
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse({"error": "Price streaming requires the ASGI server"}, status=501)
+
+    user = await sync_to_async(_stream_user)(request)
+    if user is None or not user.is_active:
+        return JsonResponse({"detail": "Authentication credentials were not provided."}, status=401)
+
+    prefs = await UserPreferences.objects.filter(user=user).afirst()
+    crypto_assets = prefs.crypto_assets if prefs and prefs.crypto_assets else ["BTC", "ETH"]
+    rate = await sync_to_async(rate_for)(prefs.quote_currency if prefs else "USD")
+
+    response = StreamingHttpResponse(_price_events(crypto_assets, rate), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    # Stop nginx-style proxies from buffering the stream
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@throttle_classes(endpoint_throttles('ai_insight'))
 def ai_insight(request):
     """Get AI insight using OpenRouter with investor-type aware prompts."""
     from django.conf import settings
@@ -348,7 +626,8 @@ def ai_insight(request):
 
     # Get preferences
     try:
-        preferences = UserPreferences.objects.get(user=request.user)
+        with timed('prefs'):
+            preferences = UserPreferences.objects.get(user=request.user)
         crypto_assets = preferences.crypto_assets if preferences.crypto_assets else ['BTC', 'ETH']
         investor_type = preferences.investor_type or 'investor'
     except UserPreferences.DoesNotExist:
@@ -384,8 +663,10 @@ def ai_insight(request):
 
     # Try OpenRouter API
     try:
-        response = requests.post(
-            "https://openrouter.ai/api/v1/chat/completions",
+        response = upstream_request(
+            "openrouter",
+            "POST",
+            f"{settings.OPENROUTER_API_URL}/chat/completions",
             headers={
                 "Content-Type": "application/json",
                 "Authorization": f"Bearer {settings.OPENROUTER_API_KEY}",
@@ -418,10 +699,12 @@ def ai_insight(request):
             msg = msg.strip()
 
             if msg and len(msg) > 10:
-                return Response({
+                result = {
                     "insight": msg,
                     "source": "ai"
-                })
+                }
+                remember_result(request, 'ai_insight', result)
+                return Response(result)
 
     except Exception as e:
         import logging
@@ -453,6 +736,7 @@ def ai_insight(request):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@throttle_classes(endpoint_throttles('meme'))
 def meme(request):
     """Fetch a random crypto meme from meme-api.com, ensuring it's an actual meme image"""
     import random
@@ -475,8 +759,10 @@ def meme(request):
     # Try each subreddit until we get a valid meme
     for subreddit in meme_subreddits:
         try:
-            response = requests.get(
-                f'https://meme-api.com/gimme/{subreddit}',
+            response = upstream_request(
+                'meme-api',
+                'GET',
+                f'{settings.MEME_API_URL}/gimme/{subreddit}',
                 timeout=5
             )
             if response.status_code == 200:
@@ -498,25 +784,64 @@ def meme(request):
                 is_image = meme_url and any(ext in meme_url.lower() for ext in ['.jpg', '.jpeg', '.png', '.gif', 'i.redd.it', 'i.imgur.com'])
                 
                 if meme_url and is_image and not is_not_meme:
-                    return Response({'url': meme_url})
+                    result = {'url': _proxied_meme_url(request, meme_url), 'source_url': meme_url}
+                    remember_result(request, 'meme', result)
+                    return Response(result)
         except Exception:
             continue  # Try next subreddit
     
     # If all subreddits fail, try one more time with random selection
     try:
         random_sub = random.choice(meme_subreddits[:3])  # Focus on top meme subreddits
-        response = requests.get(
-            f'https://meme-api.com/gimme/{random_sub}',
+        response = upstream_request(
+            'meme-api',
+            'GET',
+            f'{settings.MEME_API_URL}/gimme/{random_sub}',
             timeout=5
         )
         if response.status_code == 200:
             data = response.json()
             meme_url = data.get('url')
             if meme_url:
-                return Response({'url': meme_url})
+                result = {'url': _proxied_meme_url(request, meme_url), 'source_url': meme_url}
+                remember_result(request, 'meme', result)
+                return Response(result)
     except Exception:
         pass
     
     # If all attempts fail, return None so frontend can show error message
     return Response({'url': None})
 
+
+def _proxied_meme_url(request, meme_url):
+    """Absolute URL of the meme's thumbnail, or the original URL until one is built."""
+    with timed('thumbnail'):
+        digest = ready_thumbnail(meme_url)
+    if digest is None:
+        return meme_url
+    return request.build_absolute_uri(reverse('meme-image', args=[digest]))
+
+
+@require_GET
+def meme_image(request, digest):
+    """
+    Serve a meme thumbnail by content hash. Public, since <img> tags can't
+    send a JWT, and the hash can only come from a meme response.
+    """
+    path = thumbnail_path(digest)
+    if path is None:
+        raise Http404('Unknown thumbnail')
+    etag = f'"{digest}"'
+    if request.headers.get('If-None-Match') == etag:
+        response = HttpResponseNotModified()
+    else:
+        try:
+            response = FileResponse(open(path, 'rb'), content_type='image/webp')
+        except FileNotFoundError:
+            # Evicted since thumbnail_path() found it
+            raise Http404('Unknown thumbnail')
+    response['ETag'] = etag
+    # The URL names the content, so it never changes
+    response['Cache-Control'] = 'public, max-age=31536000, immutable'
+    return response
+
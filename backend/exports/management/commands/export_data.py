@@ -0,0 +1,23 @@
+import sys
+
+from django.core.management.base import BaseCommand
+
+from exports.streams import DATASETS, FORMATS, export_stream
+
+
+class Command(BaseCommand):
+    help = "Stream a dataset to a file or stdout as CSV or NDJSON without loading it into memory."
+
+    def add_arguments(self, parser):
+        parser.add_argument("dataset", choices=list(DATASETS))
+        parser.add_argument("--format", choices=list(FORMATS), default="csv", help="Output format (default csv)")
+        parser.add_argument("--output", help="File to write (default stdout)")
+
+    def handle(self, *args, **options):
+        out = open(options["output"], "w", newline="") if options["output"] else sys.stdout
+        try:
+            for chunk in export_stream(options["dataset"], options["format"]):
+                out.write(chunk)
+        finally:
+            if out is not sys.stdout:
+                out.close()
@@ -0,0 +1,22 @@
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from .streams import DATASETS, FORMATS, export_stream
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def export(request, dataset, fmt):
+    """Stream a whole dataset as CSV or NDJSON (staff only), e.g. /api/exports/votes.csv"""
+    if dataset not in DATASETS or fmt not in FORMATS:
+        return Response(
+            {'error': f"Use one of {', '.join(DATASETS)} as {' or '.join(FORMATS)}"},
+            status=404,
+        )
+
+    response = StreamingHttpResponse(export_stream(dataset, fmt), content_type=FORMATS[fmt])
+    filename = f"{dataset}-{timezone.now():%Y%m%d-%H%M%S}.{fmt}"
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
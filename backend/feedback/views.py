@@ -2,6 +2,7 @@ from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from monitoring.timing import timed
 from .models import Vote
 from .serializers import VoteSerializer
 
@@ -10,8 +11,9 @@ from .serializers import VoteSerializer
 @permission_classes([IsAuthenticated])
 def get_votes(request):
     """Get all votes for the current user"""
-    votes = Vote.objects.filter(user=request.user)
-    vote_dict = {vote.section: vote.vote for vote in votes}
+    with timed('db'):
+        votes = Vote.objects.filter(user=request.user)
+        vote_dict = {vote.section: vote.vote for vote in votes}
     return Response(vote_dict)
 
 
@@ -20,11 +22,12 @@ def get_votes(request):
 def vote(request):
     serializer = VoteSerializer(data=request.data)
     if serializer.is_valid():
-        vote_obj, created = Vote.objects.update_or_create(
-            user=request.user,
-            section=serializer.validated_data['section'],
-            defaults={'vote': serializer.validated_data['vote']}
-        )
+        with timed('db'):
+            vote_obj, created = Vote.objects.update_or_create(
+                user=request.user,
+                section=serializer.validated_data['section'],
+                defaults={'vote': serializer.validated_data['vote']}
+            )
         return Response(
             VoteSerializer(vote_obj).data,
             status=status.HTTP_201_CREATED if created else status.HTTP_200_OK
@@ -0,0 +1,33 @@
+"""
+Gunicorn configuration (loaded automatically from the working directory).
+
+Runs threaded workers and prepares the shared directory prometheus_client
+uses to aggregate metrics from every worker process.
+"""
+import os
+import shutil
+
+# Must be set before prometheus_client is imported anywhere, since it picks
+# its storage backend at import time and workers inherit the master's modules.
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/moveo-prometheus")
+
+# Threads let a worker keep answering cheap requests while others wait on
+# upstream APIs. ADMISSION_UPSTREAM_LIMIT (default 6) must stay below
+# `threads` so some are always left for them. A -k on the command line,
+# e.g. the uvicorn worker for the live stream, still takes precedence.
+worker_class = "gthread"
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+threads = int(os.getenv("GUNICORN_THREADS", "8"))
+
+
+def on_starting(server):
+    # Stale files from a previous run would be summed into the new totals
+    path = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path, exist_ok=True)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
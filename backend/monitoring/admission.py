@@ -0,0 +1,71 @@
+"""
+Per-process admission control for endpoint classes.
+
+Each class of endpoints (see settings.ADMISSION_CLASSES) has a cap on
+concurrent in-flight requests in this worker. Upstream-bound views that
+arrive over their cap are not queued. They run in shed mode: every
+upstream_request() call fails immediately with UpstreamShed, so the view
+answers from its cache or its built-in fallback at once. Views in other
+classes that go over their cap get a 503.
+
+Keep the upstream cap below the worker's thread count. The remaining
+threads then stay free for cheap endpoints like auth/me/ and preferences/,
+even when every upstream call is slow.
+"""
+import threading
+from contextvars import ContextVar
+
+import requests
+from django.conf import settings
+
+
+DEFAULT_CLASS = "default"
+# The class whose requests are degraded rather than refused when over capacity
+SHED_CLASS = "upstream"
+
+_shed = ContextVar("admission_shed", default=False)
+
+
+class UpstreamShed(requests.RequestException):
+    """Raised instead of calling an upstream while the request is being shed."""
+
+
+def is_shed():
+    return _shed.get()
+
+
+def shed():
+    """Mark the current request as shed; returns a token for reset()."""
+    return _shed.set(True)
+
+
+def reset(token):
+    _shed.reset(token)
+
+
+def endpoint_class(url_name):
+    for name, url_names in settings.ADMISSION_CLASSES.items():
+        if url_name in url_names:
+            return name
+    return DEFAULT_CLASS
+
+
+class Limiter:
+    """Non-blocking concurrency caps, one semaphore per endpoint class."""
+
+    def __init__(self, limits):
+        self._semaphores = {
+            name: threading.BoundedSemaphore(limit)
+            for name, limit in limits.items()
+            if limit > 0
+        }
+
+    def acquire(self, name):
+        """True if admitted (or the class is uncapped), False if at capacity."""
+        semaphore = self._semaphores.get(name)
+        return semaphore is None or semaphore.acquire(blocking=False)
+
+    def release(self, name):
+        semaphore = self._semaphores.get(name)
+        if semaphore is not None:
+            semaphore.release()
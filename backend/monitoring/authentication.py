@@ -0,0 +1,36 @@
+import hmac
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from rest_framework.authentication import BaseAuthentication
+from rest_framework.permissions import BasePermission
+
+
+class MetricsTokenAuthentication(BaseAuthentication):
+    """
+    Accept `Authorization: Bearer <METRICS_TOKEN>` so Prometheus can scrape
+    without a user account. Any other bearer token falls through to JWT auth.
+    """
+
+    def authenticate(self, request):
+        token = settings.METRICS_TOKEN
+        if not token:
+            return None
+
+        header = request.META.get('HTTP_AUTHORIZATION', '')
+        scheme, _, value = header.partition(' ')
+        if scheme.lower() != 'bearer' or not hmac.compare_digest(value.strip(), token):
+            return None
+        return (AnonymousUser(), 'metrics-token')
+
+    def authenticate_header(self, request):
+        return 'Bearer realm="api"'
+
+
+class HasMetricsAccess(BasePermission):
+    """Allow the metrics scrape token or any staff user."""
+
+    def has_permission(self, request, view):
+        if request.auth == 'metrics-token':
+            return True
+        return bool(request.user and request.user.is_staff)
@@ -0,0 +1,46 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+
+
+class Command(BaseCommand):
+    help = "Exercise the database connection pool from concurrent threads and report checkout wait times."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=8, help="Concurrent threads (default 8)")
+        parser.add_argument("--iterations", type=int, default=50, help="Checkouts per thread (default 50)")
+
+    def handle(self, *args, **options):
+        if not connection.pool:
+            raise CommandError("Connection pooling is not enabled (needs PostgreSQL and DB_POOL_ENABLED=true).")
+
+        def worker(_):
+            # Each thread gets its own connection wrapper; close() returns to the pool
+            conn = connections["default"]
+            waits = []
+            try:
+                for _ in range(options["iterations"]):
+                    start = time.perf_counter()
+                    conn.ensure_connection()
+                    waits.append(time.perf_counter() - start)
+                    with conn.cursor() as cursor:
+                        cursor.execute("SELECT 1")
+                    conn.close()
+            finally:
+                conn.close()
+            return waits
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options["threads"]) as pool:
+            waits = sorted(w for result in pool.map(worker, range(options["threads"])) for w in result)
+        elapsed = time.perf_counter() - start
+
+        def pct(p):
+            return waits[min(len(waits) - 1, int(len(waits) * p / 100))] * 1000
+
+        self.stdout.write(f"{len(waits)} checkouts in {elapsed:.2f}s ({len(waits) / elapsed:.0f}/s)")
+        self.stdout.write(f"wait p50={pct(50):.2f}ms p95={pct(95):.2f}ms p99={pct(99):.2f}ms max={waits[-1] * 1000:.2f}ms")
+        for key, value in sorted(connection.pool.get_stats().items()):
+            self.stdout.write(f"  {key}: {value}")
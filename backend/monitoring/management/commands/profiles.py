@@ -0,0 +1,44 @@
+import io
+import pstats
+
+from django.core.management.base import BaseCommand
+
+from monitoring.profiling import list_profiles
+
+
+class Command(BaseCommand):
+    help = "List stored request profiles and summarize the top cumulative hotspots across them."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--path", help="Only include profiles whose URL starts with this prefix")
+        parser.add_argument("--limit", type=int, default=20, help="Number of profiles to list (default 20)")
+        parser.add_argument("--top", type=int, default=25, help="Number of hotspots to print (default 25)")
+
+    def handle(self, *args, **options):
+        profiles = list_profiles()
+        if options["path"]:
+            profiles = [p for p in profiles if p[2].get("url", "").startswith(options["path"])]
+
+        if not profiles:
+            self.stdout.write("No stored profiles.")
+            return
+
+        self.stdout.write(f"{len(profiles)} stored profile(s):")
+        for profile_id, _, meta in profiles[:options["limit"]]:
+            self.stdout.write(
+                f"  {profile_id}  {meta.get('timestamp', '?')}  "
+                f"{meta.get('duration_ms', '?'):>8} ms  {meta.get('status', '?')}  "
+                f"{meta.get('method', '?')} {meta.get('url', '?')}  "
+                f"user={meta.get('user') or '-'}  ({meta.get('trigger', '?')})"
+            )
+
+        # Merge every matching profile so recurring hotspots stand out
+        # pstats prints piecemeal, which OutputWrapper would split into lines
+        buffer = io.StringIO()
+        stats = pstats.Stats(str(profiles[0][1]), stream=buffer)
+        for _, path, _ in profiles[1:]:
+            stats.add(str(path))
+
+        self.stdout.write(f"\nTop {options['top']} functions by cumulative time across {len(profiles)} profile(s):")
+        stats.strip_dirs().sort_stats("cumulative").print_stats(options["top"])
+        self.stdout.write(buffer.getvalue())
@@ -0,0 +1,155 @@
+"""
+Prometheus metrics for the API hot paths.
+
+When PROMETHEUS_MULTIPROC_DIR is set (see gunicorn.conf.py) prometheus_client
+writes every observation to per-process mmap files, so the /api/metrics/
+view can aggregate all gunicorn workers instead of only the one serving it.
+"""
+import time
+
+import requests
+from django.core.cache import cache
+from prometheus_client import Counter, Gauge, Histogram
+
+from . import admission, timing
+
+
+# Buckets tuned for API work: sub-millisecond cache hits up to 10s upstream timeouts
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+HTTP_REQUEST_SECONDS = Histogram(
+    'http_request_duration_seconds',
+    'Time spent handling an API request',
+    ['view', 'method', 'status'],
+    buckets=LATENCY_BUCKETS,
+)
+
+DB_QUERIES_PER_REQUEST = Histogram(
+    'http_request_db_queries',
+    'Number of database queries executed per request',
+    ['view'],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
+
+DB_SECONDS_PER_REQUEST = Histogram(
+    'http_request_db_duration_seconds',
+    'Total time spent in database queries per request',
+    ['view'],
+    buckets=LATENCY_BUCKETS,
+)
+
+UPSTREAM_REQUEST_SECONDS = Histogram(
+    'upstream_request_duration_seconds',
+    'Latency of calls to third-party APIs',
+    ['upstream'],
+    buckets=LATENCY_BUCKETS,
+)
+
+UPSTREAM_REQUESTS = Counter(
+    'upstream_requests',
+    'Calls to third-party APIs by response status',
+    ['upstream', 'status'],
+)
+
+CACHE_REQUESTS = Counter(
+    'cache_requests',
+    'Cache lookups by key family and result',
+    ['cache', 'result'],
+)
+
+DB_POOL_WAIT_SECONDS = Histogram(
+    'db_pool_wait_seconds',
+    'Time spent checking a connection out of the pool, including the health check',
+    ['alias'],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0, 10.0),
+)
+
+DB_POOL_TIMEOUTS = Counter(
+    'db_pool_timeouts',
+    'Checkouts that gave up waiting for a free pooled connection',
+    ['alias'],
+)
+
+# livesum: report the total across running workers, each of which owns a pool
+DB_POOL_SIZE = Gauge(
+    'db_pool_size',
+    'Connections currently held by the pool',
+    ['alias'],
+    multiprocess_mode='livesum',
+)
+
+DB_POOL_AVAILABLE = Gauge(
+    'db_pool_available',
+    'Idle connections in the pool after the last checkout',
+    ['alias'],
+    multiprocess_mode='livesum',
+)
+
+
+LIVE_SUBSCRIBERS = Gauge(
+    'live_subscribers',
+    'Open price stream connections',
+    multiprocess_mode='livesum',
+)
+
+LIVE_DROPPED_EVENTS = Counter(
+    'live_dropped_events',
+    'Price events discarded because a subscriber fell behind',
+)
+
+
+ALERT_EVALUATION_SECONDS = Histogram(
+    'alert_evaluation_seconds',
+    'Time to evaluate one price update against the alert index',
+    buckets=(0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.05),
+)
+
+ALERTS_TRIGGERED = Counter(
+    'alerts_triggered',
+    'Price alerts whose threshold was crossed',
+)
+
+
+ADMISSION_IN_FLIGHT = Gauge(
+    'admission_in_flight',
+    'Admitted requests currently running, by endpoint class',
+    ['endpoint_class'],
+    multiprocess_mode='livesum',
+)
+
+ADMISSION_SHED = Counter(
+    'admission_shed',
+    'Requests over their endpoint class cap (degraded or refused)',
+    ['endpoint_class', 'view'],
+)
+
+
+def upstream_request(upstream, method, url, **kwargs):
+    """
+    requests.request() wrapper that records latency and status per upstream.
+    Exceptions are counted as status "error" and re-raised unchanged. While
+    admission control is shedding the request, raises UpstreamShed at once.
+    """
+    if admission.is_shed():
+        UPSTREAM_REQUESTS.labels(upstream, 'shed').inc()
+        raise admission.UpstreamShed(f'{upstream} skipped: request is being shed')
+
+    start = time.perf_counter()
+    status = 'error'
+    try:
+        response = requests.request(method, url, **kwargs)
+        status = str(response.status_code)
+        return response
+    finally:
+        elapsed = time.perf_counter() - start
+        UPSTREAM_REQUEST_SECONDS.labels(upstream).observe(elapsed)
+        timing.record(f'upstream-{upstream}', elapsed)
+        UPSTREAM_REQUESTS.labels(upstream, status).inc()
+
+
+def cache_get(name, key):
+    """cache.get() wrapper that counts hits and misses for a key family."""
+    with timing.timed('cache'):
+        value = cache.get(key)
+    CACHE_REQUESTS.labels(name, 'miss' if value is None else 'hit').inc()
+    return value
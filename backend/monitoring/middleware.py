@@ -0,0 +1,224 @@
+import cProfile
+import logging
+import random
+import threading
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.http import JsonResponse
+from django.urls import Resolver404, resolve
+from django.utils import timezone
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from . import admission, profiling, timing
+from .metrics import (
+    ADMISSION_IN_FLIGHT,
+    ADMISSION_SHED,
+    DB_QUERIES_PER_REQUEST,
+    DB_SECONDS_PER_REQUEST,
+    HTTP_REQUEST_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class MetricsMiddleware:
+    """Record latency and database usage for every request, labelled by URL name."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        queries = _QueryCounter()
+        start = time.perf_counter()
+        with connection.execute_wrapper(queries):
+            response = self.get_response(request)
+        elapsed = time.perf_counter() - start
+
+        # Label by URL name rather than path to keep cardinality bounded
+        match = getattr(request, 'resolver_match', None)
+        view = match.url_name if match and match.url_name else 'unmatched'
+
+        HTTP_REQUEST_SECONDS.labels(view, request.method, str(response.status_code)).observe(elapsed)
+        DB_QUERIES_PER_REQUEST.labels(view).observe(queries.count)
+        DB_SECONDS_PER_REQUEST.labels(view).observe(queries.seconds)
+        return response
+
+
+class _QueryCounter:
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.seconds += time.perf_counter() - start
+
+
+class ServerTimingMiddleware:
+    """
+    Emit a Server-Timing header built from the segments recorded during the
+    request. Removed from the stack entirely unless SERVER_TIMING_ENABLED.
+    """
+
+    def __init__(self, get_response):
+        if not settings.SERVER_TIMING_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.allow_origin = ', '.join(settings.CORS_ALLOWED_ORIGINS)
+
+    def __call__(self, request):
+        token = timing.start_collecting()
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            segments = timing.stop_collecting(token)
+        segments['total'] = time.perf_counter() - start
+
+        response['Server-Timing'] = ', '.join(
+            f'{name};dur={seconds * 1000:.1f}' for name, seconds in segments.items()
+        )
+        # Browsers hide Server-Timing from cross-origin callers without this
+        if self.allow_origin:
+            response['Timing-Allow-Origin'] = self.allow_origin
+        return response
+
+    def process_template_response(self, request, response):
+        # DRF responses are rendered after the view returns; time that step too
+        start = time.perf_counter()
+        response.add_post_render_callback(
+            lambda rendered: timing.record('render', time.perf_counter() - start)
+        )
+        return response
+
+
+class ProfilingMiddleware:
+    """
+    Run selected requests under cProfile and store the result with
+    monitoring.profiling. A request is profiled when a staff user sends the
+    PROFILING_HEADER, or when it falls within PROFILING_SAMPLE_RATE.
+    """
+
+    # cProfile cannot run two profilers at once, so concurrent triggers are skipped
+    _lock = threading.Lock()
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.header = 'HTTP_' + settings.PROFILING_HEADER.upper().replace('-', '_')
+
+    def __call__(self, request):
+        trigger = self._trigger(request)
+        if trigger is None or not self._lock.acquire(blocking=False):
+            return self.get_response(request)
+
+        try:
+            profiler = cProfile.Profile()
+            start = time.perf_counter()
+            response = profiler.runcall(self.get_response, request)
+            elapsed = time.perf_counter() - start
+
+            try:
+                profile_id = profiling.save_profile(profiler, {
+                    'method': request.method,
+                    'url': request.get_full_path(),
+                    'user': self._username(request),
+                    'status': response.status_code,
+                    'duration_ms': round(elapsed * 1000, 1),
+                    'trigger': trigger,
+                    'timestamp': timezone.now().isoformat(),
+                })
+            except OSError as e:
+                # A full or read-only profile directory must not fail the request
+                logger.error(f"Saving profile for {request.get_full_path()} failed: {e}")
+                return response
+        finally:
+            self._lock.release()
+
+        response['X-Profile-Id'] = profile_id
+        return response
+
+    def _trigger(self, request):
+        if request.META.get(self.header) and self._is_staff(request):
+            return 'header'
+        rate = settings.PROFILING_SAMPLE_RATE
+        if rate and random.random() < rate:
+            return 'sample'
+        return None
+
+    def _is_staff(self, request):
+        # DRF authenticates inside the view, so resolve the JWT here ourselves
+        try:
+            result = JWTAuthentication().authenticate(request)
+        except AuthenticationFailed:
+            return False
+        return result is not None and result[0].is_staff
+
+    def _username(self, request):
+        # DRF copies the authenticated user back onto the Django request
+        user = getattr(request, 'user', None)
+        if user is None or not user.is_authenticated:
+            return None
+        return user.get_username()
+
+
+class AdmissionControlMiddleware:
+    """
+    Cap concurrent requests per endpoint class (see admission.py). Upstream
+    requests over the cap are served degraded and marked X-Degraded; other
+    classes over their cap get a 503.
+    """
+
+    def __init__(self, get_response):
+        if not settings.ADMISSION_CONTROL_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.limiter = admission.Limiter(settings.ADMISSION_LIMITS)
+
+    def __call__(self, request):
+        # Decided here rather than in process_view so the shed flag is set and
+        # reset in the same frame; under ASGI those hooks run in different contexts.
+        try:
+            url_name = resolve(request.path_info).url_name or 'unmatched'
+        except Resolver404:
+            return self.get_response(request)
+        endpoint_class = admission.endpoint_class(url_name)
+
+        if self.limiter.acquire(endpoint_class):
+            ADMISSION_IN_FLIGHT.labels(endpoint_class).inc()
+            request.admission_refused = False
+            try:
+                return self.get_response(request)
+            finally:
+                self.limiter.release(endpoint_class)
+                ADMISSION_IN_FLIGHT.labels(endpoint_class).dec()
+
+        ADMISSION_SHED.labels(endpoint_class, url_name).inc()
+        if endpoint_class != admission.SHED_CLASS:
+            # Refused in process_view, so the 503 still passes through CORS and the rest
+            request.admission_refused = True
+            return self.get_response(request)
+
+        # Run the view anyway; its upstream calls fail fast so it answers from cache or fallback
+        request.admission_refused = False
+        token = admission.shed()
+        try:
+            response = self.get_response(request)
+        finally:
+            admission.reset(token)
+        response['X-Degraded'] = 'shed'
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not getattr(request, 'admission_refused', False):
+            return None
+        response = JsonResponse({'error': 'Server busy, please retry'}, status=503)
+        response['Retry-After'] = '1'
+        return response
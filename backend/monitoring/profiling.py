@@ -0,0 +1,58 @@
+"""
+Bounded on-disk storage for per-request cProfile dumps.
+
+Each profile is stored as `<time_ns>-<pid>.prof` (pstats format) next to a
+`.json` file with the request metadata. Only the newest PROFILING_MAX_FILES
+profiles are kept.
+"""
+import json
+import os
+import time
+from pathlib import Path
+
+from django.conf import settings
+
+
+def profile_dir():
+    return Path(settings.PROFILING_DIR)
+
+
+def save_profile(profiler, meta):
+    """Dump `profiler` with its metadata, evict the oldest profiles and return the profile id."""
+    directory = profile_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+
+    profile_id = f"{time.time_ns()}-{os.getpid()}"
+    profiler.dump_stats(directory / f"{profile_id}.prof")
+    with open(directory / f"{profile_id}.json", "w") as f:
+        json.dump(meta, f)
+
+    _prune(directory)
+    return profile_id
+
+
+def list_profiles():
+    """Return (profile_id, path, meta) for every stored profile, newest first."""
+    directory = profile_dir()
+    if not directory.is_dir():
+        return []
+
+    profiles = []
+    for path in sorted(directory.glob("*.prof"), reverse=True):
+        try:
+            with open(path.with_suffix(".json")) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            meta = {}
+        profiles.append((path.stem, path, meta))
+    return profiles
+
+
+def _prune(directory):
+    # Ids start with a nanosecond timestamp, so name order is age order
+    files = sorted(directory.glob("*.prof"))
+    # Not files[:-limit]: that keeps everything when the limit is 0
+    stale = files[:max(len(files) - settings.PROFILING_MAX_FILES, 0)]
+    for path in stale:
+        path.unlink(missing_ok=True)
+        path.with_suffix(".json").unlink(missing_ok=True)
@@ -0,0 +1,51 @@
+"""
+Per-request timing segments for the Server-Timing header.
+
+Segments only accumulate while ServerTimingMiddleware has opened a
+collector for the current request; otherwise `timed` and `record` reduce
+to a single ContextVar lookup.
+"""
+import time
+from contextvars import ContextVar
+
+
+_segments = ContextVar('server_timing_segments', default=None)
+
+
+def start_collecting():
+    """Open a segment collector for the current request and return its reset token."""
+    return _segments.set({})
+
+
+def stop_collecting(token):
+    """Close the collector opened by start_collecting() and return its segments."""
+    segments = _segments.get()
+    _segments.reset(token)
+    return segments or {}
+
+
+def record(name, seconds):
+    """Add `seconds` to the named segment of the current request, if collecting."""
+    segments = _segments.get()
+    if segments is not None:
+        segments[name] = segments.get(name, 0.0) + seconds
+
+
+class timed:
+    """Context manager that adds the time spent in its block to a segment."""
+
+    __slots__ = ('name', 'start')
+
+    def __init__(self, name):
+        self.name = name
+        self.start = None
+
+    def __enter__(self):
+        if _segments.get() is not None:
+            self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.start is not None:
+            record(self.name, time.perf_counter() - self.start)
+        return False
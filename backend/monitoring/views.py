@@ -0,0 +1,22 @@
+import os
+
+from django.http import HttpResponse
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, generate_latest, multiprocess
+from rest_framework.decorators import api_view, authentication_classes, permission_classes
+from users.authentication import TimedJWTAuthentication
+
+from .authentication import HasMetricsAccess, MetricsTokenAuthentication
+
+
+@api_view(['GET'])
+@authentication_classes([MetricsTokenAuthentication, TimedJWTAuthentication])
+@permission_classes([HasMetricsAccess])
+def metrics(request):
+    """Expose Prometheus metrics, aggregated across workers in multiprocess mode."""
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+
+    return HttpResponse(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
@@ -5,3 +5,5 @@ class OnboardingConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'onboarding'
 
+    def ready(self):
+        from . import signals  # noqa: F401
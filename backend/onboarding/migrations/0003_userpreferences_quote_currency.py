@@ -0,0 +1,18 @@
+# Generated by Django 5.1.4 on 2026-10-19 13:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('onboarding', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userpreferences',
+            name='quote_currency',
+            field=models.CharField(default='USD', max_length=3),
+        ),
+    ]
@@ -0,0 +1,96 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# CONCURRENTLY builds without blocking writes; it can't run inside a
+# transaction, hence atomic = False below
+POSTGRES_INDEXES = [
+    (
+        "onboarding_prefs_investor_idx",
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS onboarding_prefs_investor_idx "
+        "ON onboarding_userpreferences (investor_type)",
+    ),
+    (
+        "onboarding_prefs_assets_gin",
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS onboarding_prefs_assets_gin "
+        "ON onboarding_userpreferences USING GIN (crypto_assets jsonb_path_ops)",
+    ),
+    (
+        "onboarding_prefs_content_gin",
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS onboarding_prefs_content_gin "
+        "ON onboarding_userpreferences USING GIN (content_preferences jsonb_path_ops)",
+    ),
+]
+
+
+def create_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        for _, statement in POSTGRES_INDEXES:
+            schema_editor.execute(statement)
+        return
+    model = apps.get_model("onboarding", "UserPreferences")
+    schema_editor.add_index(model, models.Index(fields=["investor_type"], name="onboarding_prefs_investor_idx"))
+
+
+def drop_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        for name, _ in POSTGRES_INDEXES:
+            schema_editor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+        return
+    model = apps.get_model("onboarding", "UserPreferences")
+    schema_editor.remove_index(model, models.Index(fields=["investor_type"], name="onboarding_prefs_investor_idx"))
+
+
+def backfill_tags(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        return
+    UserPreferences = apps.get_model("onboarding", "UserPreferences")
+    PreferenceTag = apps.get_model("onboarding", "PreferenceTag")
+    batch = []
+    rows = UserPreferences.objects.values_list("id", "crypto_assets", "content_preferences")
+    for prefs_id, assets, content in rows.iterator(chunk_size=2000):
+        batch += [PreferenceTag(preferences_id=prefs_id, kind="asset", value=v) for v in set(assets or [])]
+        batch += [PreferenceTag(preferences_id=prefs_id, kind="content", value=v) for v in set(content or [])]
+        if len(batch) >= 5000:
+            PreferenceTag.objects.bulk_create(batch)
+            batch = []
+    PreferenceTag.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('onboarding', '0003_userpreferences_quote_currency'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PreferenceTag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('asset', 'Crypto asset'), ('content', 'Content preference')], max_length=10)),
+                ('value', models.CharField(max_length=100)),
+                ('preferences', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tags', to='onboarding.userpreferences')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['kind', 'value', 'preferences'], name='onboarding_tag_lookup_idx')],
+            },
+        ),
+        # The btree on investor_type is part of the model state; the GIN
+        # indexes exist only on Postgres and are left out of it so SQLite
+        # table rebuilds never try to recreate them
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddIndex(
+                    model_name='userpreferences',
+                    index=models.Index(fields=['investor_type'], name='onboarding_prefs_investor_idx'),
+                ),
+            ],
+            database_operations=[
+                migrations.RunPython(create_indexes, drop_indexes),
+            ],
+        ),
+        migrations.RunPython(backfill_tags, migrations.RunPython.noop),
+    ]
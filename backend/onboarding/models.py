@@ -7,4 +7,26 @@ class UserPreferences(models.Model):
     crypto_assets = models.JSONField(default=list)
     investor_type = models.CharField(max_length=100)
     content_preferences = models.JSONField(default=list)
+    quote_currency = models.CharField(max_length=3, default='USD')
+
+    class Meta:
+        indexes = [models.Index(fields=['investor_type'], name='onboarding_prefs_investor_idx')]
+
+
+class PreferenceTag(models.Model):
+    """
+    One asset or content preference of a user, for backends without GIN
+    indexes on JSON. Kept in sync by onboarding.signals except on
+    PostgreSQL, where segments query the JSON arrays directly.
+    """
+    KIND_CHOICES = [
+        ('asset', 'Crypto asset'),
+        ('content', 'Content preference'),
+    ]
+    preferences = models.ForeignKey(UserPreferences, on_delete=models.CASCADE, related_name='tags')
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    value = models.CharField(max_length=100)
+
+    class Meta:
+        indexes = [models.Index(fields=['kind', 'value', 'preferences'], name='onboarding_tag_lookup_idx')]
 
@@ -0,0 +1,32 @@
+"""
+Audience segments over user preferences.
+
+On PostgreSQL the asset and content filters are JSON containment (@>)
+queries served by the GIN jsonb_path_ops indexes from migration 0004.
+Other backends have no such index, so they go through the normalized
+PreferenceTag table, one indexed semi-join per required value.
+"""
+from django.db import connection
+
+from .models import PreferenceTag, UserPreferences
+
+
+def segment(assets=(), investor_type=None, content=()):
+    """UserPreferences holding all `assets` and `content` preferences, optionally of one investor type."""
+    queryset = UserPreferences.objects.all()
+    if investor_type:
+        queryset = queryset.filter(investor_type=investor_type)
+
+    if connection.vendor == 'postgresql':
+        if assets:
+            queryset = queryset.filter(crypto_assets__contains=list(assets))
+        if content:
+            queryset = queryset.filter(content_preferences__contains=list(content))
+        return queryset
+
+    for kind, values in (('asset', assets), ('content', content)):
+        for value in values:
+            queryset = queryset.filter(
+                id__in=PreferenceTag.objects.filter(kind=kind, value=value).values('preferences_id')
+            )
+    return queryset
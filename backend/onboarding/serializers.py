@@ -1,9 +1,12 @@
 from rest_framework import serializers
+from dashboard.fx import SUPPORTED_CURRENCIES
 from .models import UserPreferences
 
 
 class UserPreferencesSerializer(serializers.ModelSerializer):
+    quote_currency = serializers.ChoiceField(choices=SUPPORTED_CURRENCIES, required=False)
+
     class Meta:
         model = UserPreferences
-        fields = ['crypto_assets', 'investor_type', 'content_preferences']
+        fields = ['crypto_assets', 'investor_type', 'content_preferences', 'quote_currency']
 
@@ -0,0 +1,17 @@
+from django.db import connection
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .models import PreferenceTag, UserPreferences
+
+
+@receiver(post_save, sender=UserPreferences)
+def sync_preference_tags(sender, instance, **kwargs):
+    """Mirror the JSON arrays into PreferenceTag rows where there is no GIN index to query them."""
+    if connection.vendor == 'postgresql':
+        return
+    PreferenceTag.objects.filter(preferences=instance).delete()
+    PreferenceTag.objects.bulk_create(
+        [PreferenceTag(preferences=instance, kind='asset', value=v) for v in set(instance.crypto_assets or [])]
+        + [PreferenceTag(preferences=instance, kind='content', value=v) for v in set(instance.content_preferences or [])]
+    )
@@ -1,9 +1,10 @@
 from django.urls import path
-from .views import onboarding, get_preferences, update_preferences
+from .views import onboarding, get_preferences, update_preferences, segments
 
 urlpatterns = [
     path('onboarding/', onboarding, name='onboarding'),
     path('preferences/', get_preferences, name='get_preferences'),
     path('preferences/update/', update_preferences, name='update_preferences'),
+    path('segments/', segments, name='segments'),
 ]
 
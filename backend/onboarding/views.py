@@ -1,8 +1,10 @@
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
+from monitoring.timing import timed
 from .models import UserPreferences
+from .segments import segment
 from .serializers import UserPreferencesSerializer
 
 
@@ -11,13 +13,14 @@ from .serializers import UserPreferencesSerializer
 def onboarding(request):
     serializer = UserPreferencesSerializer(data=request.data)
     if serializer.is_valid():
-        preferences, created = UserPreferences.objects.update_or_create(
-            user=request.user,
-            defaults=serializer.validated_data
-        )
-        # Mark user as having completed onboarding
-        request.user.has_completed_onboarding = True
-        request.user.save()
+        with timed('db'):
+            preferences, created = UserPreferences.objects.update_or_create(
+                user=request.user,
+                defaults=serializer.validated_data
+            )
+            # Mark user as having completed onboarding
+            request.user.has_completed_onboarding = True
+            request.user.save()
         return Response(
             UserPreferencesSerializer(preferences).data,
             status=status.HTTP_201_CREATED if created else status.HTTP_200_OK
@@ -30,13 +33,15 @@ def onboarding(request):
 def get_preferences(request):
     """Get current user preferences"""
     try:
-        preferences = UserPreferences.objects.get(user=request.user)
+        with timed('prefs'):
+            preferences = UserPreferences.objects.get(user=request.user)
         return Response(UserPreferencesSerializer(preferences).data)
     except UserPreferences.DoesNotExist:
         return Response({
             'crypto_assets': [],
             'investor_type': '',
-            'content_preferences': []
+            'content_preferences': [],
+            'quote_currency': 'USD'
         })
 
 
@@ -45,16 +50,65 @@ def get_preferences(request):
 def update_preferences(request):
     """Update user preferences"""
     try:
-        preferences = UserPreferences.objects.get(user=request.user)
+        with timed('prefs'):
+            preferences = UserPreferences.objects.get(user=request.user)
         serializer = UserPreferencesSerializer(preferences, data=request.data, partial=True)
         if serializer.is_valid():
-            serializer.save()
+            with timed('db'):
+                serializer.save()
             return Response(serializer.data)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     except UserPreferences.DoesNotExist:
         # If preferences don't exist, create them
         serializer = UserPreferencesSerializer(data=request.data)
         if serializer.is_valid():
-            preferences = serializer.save(user=request.user)
+            with timed('db'):
+                preferences = serializer.save(user=request.user)
             return Response(UserPreferencesSerializer(preferences).data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+def _list_param(request, name):
+    values = []
+    for raw in request.query_params.getlist(name):
+        values += [v.strip() for v in raw.split(',') if v.strip()]
+    return values
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def segments(request):
+    """
+    Staff only. Count and list users whose preferences hold every ?asset=
+    and ?content= value (comma-separated or repeated), optionally filtered
+    by ?investor_type=. Pages by preferences id with ?cursor= and ?limit=.
+    """
+    assets = [a.upper() for a in _list_param(request, 'asset')]
+    content = _list_param(request, 'content')
+    investor_type = request.query_params.get('investor_type')
+    try:
+        cursor = int(request.query_params.get('cursor') or 0)
+        limit = min(max(int(request.query_params.get('limit', 50)), 1), 500)
+    except ValueError:
+        return Response({'error': 'cursor and limit must be integers'}, status=status.HTTP_400_BAD_REQUEST)
+
+    with timed('db'):
+        queryset = segment(assets, investor_type, content)
+        count = queryset.count()
+        page = queryset.order_by('id').select_related('user')
+        if cursor:
+            page = page.filter(id__gt=cursor)
+        rows = list(page[:limit + 1])
+
+    return Response({
+        'count': count,
+        'users': [{
+            'user_id': prefs.user_id,
+            'username': prefs.user.username,
+            'email': prefs.user.email,
+            'investor_type': prefs.investor_type,
+            'crypto_assets': prefs.crypto_assets,
+            'content_preferences': prefs.content_preferences,
+        } for prefs in rows[:limit]],
+        'next_cursor': rows[limit - 1].id if len(rows) > limit else None,
+    })
@@ -0,0 +1,12 @@
+from django.db import models
+from django.conf import settings
+
+
+class Holding(models.Model):
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    asset = models.CharField(max_length=10)
+    quantity = models.FloatField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ['user', 'asset']
@@ -0,0 +1,16 @@
+from rest_framework import serializers
+from dashboard.assets import COINGECKO_IDS
+from .models import Holding
+
+
+class HoldingSerializer(serializers.ModelSerializer):
+    asset = serializers.ChoiceField(choices=list(COINGECKO_IDS))
+
+    class Meta:
+        model = Holding
+        fields = ['asset', 'quantity']
+
+    def validate_quantity(self, value):
+        if value < 0:
+            raise serializers.ValidationError("Quantity cannot be negative")
+        return value
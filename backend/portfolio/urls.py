@@ -0,0 +1,7 @@
+from django.urls import path
+from .views import portfolio, holdings
+
+urlpatterns = [
+    path('portfolio/', portfolio, name='portfolio'),
+    path('portfolio/holdings/', holdings, name='holdings'),
+]
@@ -0,0 +1,40 @@
+"""
+Portfolio value over time from per-asset price series.
+
+Series come at different spacings and timestamps (the store's buckets,
+CoinGecko's own granularity), so each one is interpolated onto a shared
+regular grid with np.interp. The curve is then a single matrix-vector
+product of the aligned prices and the quantities.
+"""
+import numpy as np
+
+
+# Enough for 5-minute points over a day or hourly points over 90 days
+MAX_GRID_POINTS = 2500
+
+
+def common_grid(series):
+    """
+    Regular grid over the window every series covers, at the finest
+    typical spacing among them. Falls back to the union of the ranges when
+    they don't overlap; np.interp then holds each series flat at its ends.
+    """
+    starts = [ts[0] for ts, _ in series]
+    ends = [ts[-1] for ts, _ in series]
+    start, end = max(starts), min(ends)
+    if start >= end:
+        start, end = min(starts), max(ends)
+
+    steps = [np.median(np.diff(ts)) for ts, _ in series if len(ts) > 1]
+    step = max(min(steps) if steps else 1, (end - start) / (MAX_GRID_POINTS - 1), 1)
+    return np.arange(start, end + step / 2, step)
+
+
+def value_curve(series, quantities):
+    """
+    series: list of (timestamps, prices) arrays; quantities: matching list.
+    Returns (grid timestamps, portfolio values).
+    """
+    grid = common_grid(series)
+    aligned = np.vstack([np.interp(grid, ts, px) for ts, px in series])
+    return grid, np.asarray(quantities, dtype=np.float64) @ aligned
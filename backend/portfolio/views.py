@@ -0,0 +1,94 @@
+import zlib
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from dashboard.indicators import data_version, series_arrays
+from dashboard.assets import PERIOD_DAY_MAP
+from dashboard.history import load_history
+from monitoring.metrics import cache_get
+from monitoring.timing import timed
+from onboarding.models import UserPreferences
+from .models import Holding
+from .serializers import HoldingSerializer
+from .valuation import value_curve
+
+
+@api_view(['GET', 'PUT'])
+@permission_classes([IsAuthenticated])
+def holdings(request):
+    """
+    GET: the user's holdings as { "BTC": 0.5, ... }.
+    PUT: replace them with the same shape; assets left out or set to 0 are removed.
+    """
+    if request.method == 'PUT':
+        if not isinstance(request.data, dict):
+            return Response({'error': 'Expected { "ASSET": quantity, ... }'}, status=status.HTTP_400_BAD_REQUEST)
+        serializer = HoldingSerializer(
+            data=[{'asset': asset, 'quantity': quantity} for asset, quantity in request.data.items()],
+            many=True,
+        )
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        kept = {h['asset']: h['quantity'] for h in serializer.validated_data if h['quantity'] > 0}
+        # All or nothing: a failure halfway must not leave the old and new holdings mixed
+        with timed('db'), transaction.atomic():
+            Holding.objects.filter(user=request.user).exclude(asset__in=kept).delete()
+            for asset, quantity in kept.items():
+                Holding.objects.update_or_create(user=request.user, asset=asset, defaults={'quantity': quantity})
+
+    with timed('db'):
+        current = dict(Holding.objects.filter(user=request.user).values_list('asset', 'quantity'))
+    return Response(current)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def portfolio(request):
+    """
+    Current value and value history of the user's holdings in their quote
+    currency, over ?period=1d|7d|30d|1y (default 7d).
+    """
+    period = request.GET.get('period', '7d')
+    if period not in PERIOD_DAY_MAP:
+        return Response({'error': f"period must be one of {', '.join(PERIOD_DAY_MAP)}"}, status=400)
+
+    with timed('db'):
+        held = list(Holding.objects.filter(user=request.user, quantity__gt=0).order_by('asset').values_list('asset', 'quantity'))
+    with timed('prefs'):
+        prefs = UserPreferences.objects.filter(user=request.user).first()
+    quote_currency = prefs.quote_currency if prefs else 'USD'
+
+    series = {asset: load_history(asset, period, quote_currency) for asset, _ in held}
+
+    # Same holdings and same series -> same answer
+    fingerprint = ','.join(f'{asset}:{quantity!r}:{data_version(series[asset])}' for asset, quantity in held)
+    cache_key = f'portfolio_{request.user.id}_{period}_{quote_currency}_{zlib.crc32(fingerprint.encode()):08x}'
+    cached = cache_get('portfolio', cache_key)
+    if cached is not None:
+        return Response(cached)
+
+    priced = [(asset, quantity, series_arrays(series[asset])) for asset, quantity in held if series[asset]]
+    positions = [{'asset': asset, 'quantity': quantity, 'price': None, 'value': None} for asset, quantity in held]
+    history = []
+    if priced:
+        grid, values = value_curve([arrays for _, _, arrays in priced], [quantity for _, quantity, _ in priced])
+        history = [[int(t), v] for t, v in zip(grid.tolist(), values.tolist())]
+        last_prices = {asset: float(arrays[1][-1]) for asset, _, arrays in priced}
+        for position in positions:
+            price = last_prices.get(position['asset'])
+            if price is not None:
+                position['price'] = price
+                position['value'] = price * position['quantity']
+
+    result = {
+        'currency': quote_currency,
+        'total': sum(p['value'] for p in positions if p['value'] is not None),
+        'holdings': positions,
+        'history': history,
+    }
+    cache.set(cache_key, result, 3600)
+    return Response(result)
@@ -0,0 +1,10 @@
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from monitoring.timing import timed
+
+
+class TimedJWTAuthentication(JWTAuthentication):
+    """JWT authentication that reports its cost as the Server-Timing "auth" segment."""
+
+    def authenticate(self, request):
+        with timed('auth'):
+            return super().authenticate(request)